@@ -0,0 +1,273 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+import pygame
+
+ASSETS_PATH = os.path.join(".", "App", "assets")
+ATLAS_IMAGE_PATH = os.path.join(ASSETS_PATH, "atlas.png")
+ATLAS_INDEX_PATH = os.path.join(ASSETS_PATH, "atlas.json")
+SURFACE_CACHE_PATH = os.path.join(ASSETS_PATH, "__surfacecache__")
+
+# Decoded pixels are cached in this layout, behind a (width, height) header
+SURFACE_CACHE_FORMAT = "RGBA"
+SURFACE_CACHE_HEADER = struct.Struct("<II")
+
+
+def atlas_key(path, size=None):
+    """
+    Name an image in the atlas index.
+
+    Keys are relative to the assets folder and lower-cased, so "static.PNG"
+    and "static.png" find the same sprite on case-sensitive filesystems.
+
+    Args:
+        path (str): Path to the source image file.
+        size (tuple): (width, height) it is scaled to, or None for the original.
+
+    Returns:
+        str: e.g. "player/walk/1.png@50x110".
+    """
+    relative = os.path.relpath(os.path.normpath(path), os.path.normpath(ASSETS_PATH))
+    key = relative.replace(os.sep, "/").lower()
+    if size is not None:
+        key += f"@{size[0]}x{size[1]}"
+    return key
+
+
+class AssetManager:
+    """
+    Loads each image once and shares it between every entity that uses it.
+
+    Images are cached by (path, size, flip_x): the file is decoded the first
+    time it is asked for, converted to the display's pixel format, and each
+    target size and facing is derived from that decoded copy exactly once.
+    Surfaces handed out are shared, so callers must not draw on them.
+    """
+
+    def __init__(self):
+        self.images = {}  # (path, size, flip_x) -> Surface, size None if unscaled
+        self.loads = 0  # Files decoded from disk
+        self.scales = 0  # Scaled copies created
+        self.flips = 0  # Mirrored copies created
+        self.hits = 0  # Requests served from the cache
+        self.mapped = 0  # Images read from the surface cache instead of decoded
+        self.load_time = 0.0  # Seconds spent decoding and converting
+        self.scale_time = 0.0  # Seconds spent scaling
+
+        self.atlas = None  # Packed sprite sheet, see pack_atlas.py
+        self.atlas_sprites = {}  # atlas key -> (x, y, width, height)
+        self.atlas_sources = {}  # atlas key -> original (width, height)
+        self.digests = {}  # source path -> SHA-1 of its contents
+
+    def _convert(self, surface):
+        # convert_alpha() needs a display mode; without one the surface is kept
+        # as decoded and only pays the conversion cost when blitted
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha()
+
+    def _cache_file_path(self, path, size):
+        digest = self.digests.get(path)
+        if digest is None:
+            with open(path, "rb") as source_file:
+                digest = hashlib.sha1(source_file.read()).hexdigest()
+            self.digests[path] = digest
+        name = atlas_key(path).replace("/", "_")
+        scale = "original" if size is None else f"{size[0]}x{size[1]}"
+        return os.path.join(
+            SURFACE_CACHE_PATH,
+            f"{name}.{scale}.{digest}.{SURFACE_CACHE_FORMAT.lower()}",
+        )
+
+    def decode(self, path, size=None):
+        """
+        Get an image's pixels, scaled to `size`, without touching the display.
+
+        The result of decoding and scaling is kept on disk as raw pixels,
+        keyed by a hash of the source file, the size and the pixel layout.
+        Later launches map that file into memory and wrap a surface around
+        it, with no decoding or scaling at all. Editing the source image
+        changes its hash, so stale pixels are never used.
+
+        A mapped surface keeps its file mapped for as long as the surface
+        lives, so converting it and dropping it unmaps the file.
+
+        Args:
+            path (str): Path to the image file.
+            size (tuple): (width, height) to scale to, or None for the original.
+
+        Returns:
+            pygame.Surface: The pixels, not converted for the display.
+        """
+        cache_file_path = self._cache_file_path(path, size)
+        try:
+            with open(cache_file_path, "rb") as cache_file:
+                pixels = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # Missing, or empty so unmappable
+            pass
+        else:
+            width, height = SURFACE_CACHE_HEADER.unpack_from(pixels)
+            data = memoryview(pixels)[SURFACE_CACHE_HEADER.size :]
+            if len(data) == width * height * len(SURFACE_CACHE_FORMAT):
+                self.mapped += 1
+                return pygame.image.frombuffer(
+                    data, (width, height), SURFACE_CACHE_FORMAT
+                )
+            data.release()
+            pixels.close()
+
+        start = time.perf_counter()
+        surface = pygame.image.load(path)
+        self.load_time += time.perf_counter() - start
+        self.loads += 1
+        if size is not None:
+            # Only the scaled pixels are cached; the original isn't needed
+            start = time.perf_counter()
+            surface = pygame.transform.scale(surface, size)
+            self.scale_time += time.perf_counter() - start
+            self.scales += 1
+        self._write_cache(cache_file_path, surface)
+        return surface
+
+    def _write_cache(self, cache_file_path, surface):
+        os.makedirs(SURFACE_CACHE_PATH, exist_ok=True)
+
+        # Drop pixels decoded from older versions of the same image and size
+        prefix = os.path.basename(cache_file_path).rsplit(".", 2)[0] + "."
+        for old in os.listdir(SURFACE_CACHE_PATH):
+            if old.startswith(prefix):
+                os.remove(os.path.join(SURFACE_CACHE_PATH, old))
+
+        # Written under a temporary name so a crash never leaves half a file
+        temporary_path = cache_file_path + ".tmp"
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(SURFACE_CACHE_HEADER.pack(*surface.get_size()))
+            cache_file.write(pygame.image.tobytes(surface, SURFACE_CACHE_FORMAT))
+        os.replace(temporary_path, cache_file_path)
+
+    def load_atlas(self, image_path=ATLAS_IMAGE_PATH, index_path=ATLAS_INDEX_PATH):
+        """
+        Read the packed sprite atlas so sprites in it skip their own files.
+
+        Does nothing if the atlas hasn't been packed.
+
+        Args:
+            image_path (str): Path to the atlas image.
+            index_path (str): Path to the atlas metadata written with it.
+        """
+        self.use_atlas(self.read_atlas(image_path, index_path))
+
+    def read_atlas(self, image_path=ATLAS_IMAGE_PATH, index_path=ATLAS_INDEX_PATH):
+        """
+        Read and decode the atlas without touching the display, so it can
+        run on a loader thread. Pass the result to `use_atlas`.
+
+        Args:
+            image_path (str): Path to the atlas image.
+            index_path (str): Path to the atlas metadata written with it.
+
+        Returns:
+            tuple: (decoded image, index), or None if there is no atlas.
+        """
+        if not os.path.exists(image_path) or not os.path.exists(index_path):
+            return None
+
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        return self.decode(image_path), index
+
+    def use_atlas(self, atlas):
+        """
+        Start serving sprites from an atlas read by `read_atlas`. Call from
+        the main thread, after the display is set up.
+
+        Args:
+            atlas (tuple): What `read_atlas` returned.
+        """
+        if atlas is None:
+            return
+
+        start = time.perf_counter()
+        image, index = atlas
+        self.atlas = self._convert(image)
+        self.atlas_sprites = {
+            key: tuple(rect) for key, rect in index["sprites"].items()
+        }
+        self.atlas_sources = {
+            key: tuple(size) for key, size in index["sources"].items()
+        }
+        self.load_time += time.perf_counter() - start
+
+    def image(self, path, size=None, flip_x=False):
+        """
+        Get an image, optionally scaled to `size` and mirrored horizontally.
+
+        Args:
+            path (str): Path to the image file.
+            size (tuple): (width, height) to scale to, or None for the original.
+            flip_x (bool): Whether to mirror the image left to right.
+
+        Returns:
+            pygame.Surface: The shared surface.
+        """
+        key = (path, size, flip_x)
+        surface = self.images.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        if flip_x:
+            surface = pygame.transform.flip(self.image(path, size), True, False)
+            self.flips += 1
+        elif self.atlas is not None and atlas_key(path, size) in self.atlas_sprites:
+            surface = self.atlas.subsurface(self.atlas_sprites[atlas_key(path, size)])
+        else:
+            surface = self._convert(self.decode(path, size))
+
+        self.images[key] = surface
+        return surface
+
+    def image_with_height(self, path, height, flip_x=False):
+        """
+        Get an image scaled to `height`, keeping its aspect ratio.
+
+        Args:
+            path (str): Path to the image file.
+            height (int): Target height in pixels.
+            flip_x (bool): Whether to mirror the image left to right.
+
+        Returns:
+            pygame.Surface: The shared surface.
+        """
+        original_size = self.atlas_sources.get(atlas_key(path))
+        if original_size is None:
+            original_size = self.image(path).get_size()
+        width, original_height = original_size
+        size = (int(width * (height / original_height)), height)
+        return self.image(path, size, flip_x)
+
+    def stats(self):
+        """
+        Summarize cache activity so far.
+
+        Returns:
+            dict: Load, scale and hit counts plus time spent, in seconds.
+        """
+        return {
+            "loads": self.loads,
+            "scales": self.scales,
+            "flips": self.flips,
+            "hits": self.hits,
+            "mapped": self.mapped,
+            "load_time": self.load_time,
+            "scale_time": self.scale_time,
+            "cached": len(self.images),
+            "atlas_sprites": len(self.atlas_sprites),
+        }
+
+
+# Shared by every entity so each file is decoded once per process
+assets = AssetManager()
@@ -0,0 +1,231 @@
+import hashlib
+import os
+import time
+from collections import namedtuple
+import pygame
+
+SOUNDS_PATH = os.path.join(".", "App", "Sounds")
+CACHE_PATH = os.path.join(SOUNDS_PATH, "__soundcache__")
+MUSIC_PATH = os.path.join(SOUNDS_PATH, "Cute_Circus.mp3")
+
+# `max_voices` is how many copies may play at once and `cooldown` how many
+# seconds of game time must pass before the sound can start again. A
+# `reserved` sound plays on its own channel, see Audio.interrupt_music.
+SoundSpec = namedtuple(
+    "SoundSpec", ["file", "max_voices", "cooldown", "reserved"], defaults=(False,)
+)
+
+SOUND_EFFECTS = {
+    "lava": SoundSpec("windows_startup.mp3", 1, 0.0, reserved=True),
+    # Contacts fire every tick the player overlaps a hazard, so these would
+    # otherwise restart sixty times a second
+    "enemy": SoundSpec("enemy_collide.mp3", 1, 0.25),
+    "spikes": SoundSpec("spikes_collide.mp3", 1, 0.25),
+    "coin": SoundSpec("coin.mp3", 4, 0.0),
+}
+
+
+def load_sound(path):
+    """
+    Load a sound effect, decoding it only if no decoded copy is cached.
+
+    Decoded PCM is kept next to the sounds, keyed by a hash of the source
+    file and the mixer's format, so later launches build the Sound straight
+    from raw samples.
+
+    Args:
+        path (str): Path to the compressed sound file.
+
+    Returns:
+        tuple: (pygame.mixer.Sound, whether it came from the cache).
+    """
+    with open(path, "rb") as source_file:
+        digest = hashlib.sha1(source_file.read()).hexdigest()
+    frequency, size, channels = pygame.mixer.get_init()
+    name = os.path.splitext(os.path.basename(path))[0]
+    cache_file_path = os.path.join(
+        CACHE_PATH, f"{name}.{digest}.{frequency}x{size}x{channels}.pcm"
+    )
+
+    try:
+        with open(cache_file_path, "rb") as cache_file:
+            return pygame.mixer.Sound(buffer=cache_file.read()), True
+    except OSError:
+        pass
+
+    sound = pygame.mixer.Sound(path)
+    os.makedirs(CACHE_PATH, exist_ok=True)
+
+    # Drop samples decoded from older versions of the file or for another
+    # mixer format
+    for old in os.listdir(CACHE_PATH):
+        if old.startswith(f"{name}.") and old.endswith(".pcm"):
+            os.remove(os.path.join(CACHE_PATH, old))
+
+    # Written under a temporary name so a crash never leaves half a file
+    temporary_path = cache_file_path + ".tmp"
+    with open(temporary_path, "wb") as cache_file:
+        cache_file.write(sound.get_raw())
+    os.replace(temporary_path, cache_file_path)
+    return sound, False
+
+
+class Audio:
+    """
+    Sound effects and music, with limits on how often each effect plays.
+
+    Each effect has its own voice limit and retrigger cooldown (see
+    SOUND_EFFECTS), so holding still on spikes plays one sound rather than
+    one per tick. Reserved effects get a mixer channel nothing else can take:
+    the lava sound plays there while the music is paused, and the music
+    resumes when that channel goes quiet, whatever else is playing.
+
+    A disabled Audio, as in headless games, never touches the mixer.
+    """
+
+    def __init__(self, enabled=True, effects=SOUND_EFFECTS, load=True):
+        """
+        Initialize the audio, loading the sound effects if enabled.
+
+        Args:
+            enabled (bool): Whether to play anything at all.
+            effects (dict): Effect name -> SoundSpec.
+            load (bool): Load the effects now. Otherwise hand each one over
+                with `add_sound` once it has been loaded elsewhere, e.g. on
+                a loader thread; until then it is silent.
+        """
+        self.enabled = enabled
+        self.effects = effects
+        self.sounds = {}  # name -> pygame.mixer.Sound
+        self.voices = {name: [] for name in effects}  # name -> Channels playing it
+        self.time = 0.0  # Game seconds passed, advanced by `update`
+        self.last_played = {}  # name -> `time` it last started
+        self.reserved = {}  # name -> its own pygame.mixer.Channel
+        self.music_interrupted = False
+        self.skipped = 0  # Plays dropped by voice limits and cooldowns
+        self.cached = 0  # Effects loaded from decoded samples
+        self.load_time = 0.0  # Seconds spent loading the effects
+        if not enabled:
+            return
+
+        # Channels below the reserved count are never picked by Sound.play
+        reserved = [name for name, spec in effects.items() if spec.reserved]
+        pygame.mixer.set_reserved(len(reserved))
+        for channel, name in enumerate(reserved):
+            self.reserved[name] = pygame.mixer.Channel(channel)
+
+        if load:
+            start = time.perf_counter()
+            for name in effects:
+                self.add_sound(name, load_sound(self.path(name)))
+            self.load_time = time.perf_counter() - start
+
+    def path(self, name):
+        """
+        Returns:
+            str: The file effect `name` is loaded from.
+        """
+        return os.path.join(SOUNDS_PATH, self.effects[name].file)
+
+    def add_sound(self, name, loaded):
+        """
+        Make a loaded effect playable.
+
+        Args:
+            name (str): Effect name, a key of the effects table.
+            loaded (tuple): What `load_sound` returned for it.
+        """
+        sound, cached = loaded
+        self.sounds[name] = sound
+        self.cached += cached
+
+    def start_music(self, path=MUSIC_PATH, volume=0.5):
+        """
+        Loop background music. It streams from the file as it plays.
+
+        The music isn't checked in with the other sounds, so a missing file
+        just means playing without it.
+
+        Args:
+            path (str): The music file.
+            volume (float): From 0 to 1.
+        """
+        if not self.enabled or not os.path.exists(path):
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(-1, 0.0)  # Play music indefinitely
+
+    def play(self, name):
+        """
+        Play an effect unless it is cooling down or at its voice limit.
+
+        Args:
+            name (str): Effect name, a key of the effects table.
+
+        Returns:
+            bool: Whether the sound started.
+        """
+        if not self.enabled or name not in self.sounds:
+            return False
+        spec = self.effects[name]
+        last_played = self.last_played.get(name)
+        if last_played is not None and self.time - last_played < spec.cooldown:
+            self.skipped += 1
+            return False
+
+        sound = self.sounds[name]
+        # A finished voice's channel may already be playing something else
+        voices = [
+            channel
+            for channel in self.voices[name]
+            if channel.get_busy() and channel.get_sound() is sound
+        ]
+        self.voices[name] = voices
+        if len(voices) >= spec.max_voices:
+            self.skipped += 1
+            return False
+
+        if name in self.reserved:
+            channel = self.reserved[name]
+            channel.play(sound)
+        else:
+            channel = sound.play()
+        if channel is None:  # Every channel is busy
+            self.skipped += 1
+            return False
+        voices.append(channel)
+        self.last_played[name] = self.time
+        return True
+
+    def interrupt_music(self, name):
+        """
+        Pause the music and play a reserved effect on its own channel; the
+        music resumes from `update` once the effect has finished. Does
+        nothing while the effect is still playing.
+
+        Args:
+            name (str): A reserved effect's name.
+        """
+        if not self.enabled or self.reserved[name].get_busy():
+            return
+        pygame.mixer.music.pause()
+        if self.play(name):
+            self.music_interrupted = True
+        else:
+            pygame.mixer.music.unpause()
+
+    def update(self, delta_time):
+        """
+        Advance the cooldown clock and resume the music once every
+        interrupting effect has finished.
+
+        Args:
+            delta_time (float): Game time simulated since the last update.
+        """
+        self.time += delta_time
+        if not self.music_interrupted:
+            return
+        if not any(channel.get_busy() for channel in self.reserved.values()):
+            pygame.mixer.music.unpause()
+            self.music_interrupted = False
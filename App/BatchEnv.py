@@ -0,0 +1,396 @@
+import numpy as np
+from EnemySystem import EnemySystem, round_like_pygame
+from Input import LEFT, RIGHT, JUMP
+from Level import Level, DEFAULT_LEVEL
+from Player import Player, REFERENCE_TICK_RATE
+
+# Columns of the array returned by `observe`
+OBSERVATION_FIELDS = ("x", "y", "velocity_x", "velocity_y", "on_ground", "hit", "coins")
+
+
+def _rects(entities):
+    """
+    Stack entity rects into an (n, 4) array of left, top, right, bottom.
+    Empty rects are left out, as pygame never reports them colliding.
+    """
+    rects = [
+        (e.rect.left, e.rect.top, e.rect.right, e.rect.bottom)
+        for e in entities
+        if e.rect.width and e.rect.height
+    ]
+    return np.array(rects, dtype=np.int32).reshape(-1, 4)
+
+
+class BatchEnv:
+    """
+    Many players on one level, simulated together with NumPy.
+
+    Each player's state is one row across a set of arrays, and `step` applies
+    Player.update's movement, gravity and platform resolution plus Game's
+    contact rules to every row at once. A row follows exactly the same path
+    a Game would with the same controls; `python App/check_parity.py` checks
+    this against the scalar code.
+
+    Enemies don't react to players, so a single set of them moves for the
+    whole batch. Players never see each other.
+    """
+
+    def __init__(self, size, level_path=DEFAULT_LEVEL, tick_rate=60):
+        """
+        Load the level and put `size` players at its start.
+
+        Args:
+            size (int): Number of players.
+            level_path (str): Path to the level file, see Level.py.
+            tick_rate (int): Simulation ticks per second, as for Game.
+        """
+        self.size = size
+        self.tick_time = 1 / tick_rate
+        self.reference_ticks = self.tick_time * REFERENCE_TICK_RATE
+        self.level = Level.load(level_path)
+
+        # Tunables come from a real Player so the two can't drift apart
+        start_x, start_y, width, height = self.level.player_start
+        template = Player(
+            start_x,
+            start_y,
+            width,
+            height,
+            self.level.world_width,
+            self.level.world_height,
+        )
+        self.start = (start_x, start_y)
+        self.width = width
+        self.height = height
+        self.gravity = template.gravity
+        self.bounce_distance = template.bounce_effect.bounce_distance
+        self.bounce_height = template.bounce_effect.bounce_height
+        self.bounce_duration = template.bounce_effect.duration
+
+        # Static geometry, in level order: resolution order matters
+        self.platforms = _rects(self.level.platforms)
+        self.hazards = _rects([*self.level.lava_pools, *self.level.spike_traps])
+        self.coin_rects = _rects(self.level.coins)
+        self.flag = _rects([self.level.flag])
+        self.enemies = EnemySystem(self.level.enemies)
+
+        # Positions are 32-bit, like the ints inside a pygame Rect
+        self.x = np.empty(size, dtype=np.int32)
+        self.y = np.empty(size, dtype=np.int32)
+        self.velocity_x = np.empty(size, dtype=np.int32)
+        self.velocity_y = np.empty(size, dtype=np.float64)
+        self.carry_x = np.empty(size, dtype=np.float64)
+        self.on_ground = np.empty(size, dtype=bool)
+
+        # BounceLeft state: whether it runs, for how long, and where it began
+        self.hit = np.empty(size, dtype=bool)
+        self.hit_time = np.empty(size, dtype=np.float64)
+        self.hit_x = np.empty(size, dtype=np.int32)
+        self.hit_y = np.empty(size, dtype=np.int32)
+
+        self.collected = np.empty((size, len(self.coin_rects)), dtype=bool)
+        self.coins = np.empty(size, dtype=np.int32)
+        self.done = np.empty(size, dtype=bool)  # Reached the flag
+        # Which hazards, enemies first, each player touched last tick
+        self.touching = np.empty(
+            (size, len(self.enemies.rects()) + len(self.hazards)), dtype=bool
+        )
+        self.ticks = 0
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """
+        Put players back at the start of the level.
+
+        Enemies keep moving, so a player reset after the first tick meets
+        them at a different point in their patrol than a fresh Game would.
+
+        Args:
+            mask (np.ndarray): Boolean mask of players to reset; all if None.
+
+        Returns:
+            np.ndarray: The observations, see `observe`.
+        """
+        if mask is None:
+            mask = np.ones(self.size, dtype=bool)
+        self.x[mask], self.y[mask] = self.start
+        self.velocity_x[mask] = 0
+        self.velocity_y[mask] = 0.0
+        self.carry_x[mask] = 0.0
+        self.on_ground[mask] = False
+        self.hit[mask] = False
+        self.hit_time[mask] = 0.0
+        self.hit_x[mask] = 0
+        self.hit_y[mask] = 0
+        self.collected[mask] = False
+        self.coins[mask] = 0
+        self.done[mask] = False
+        self.touching[mask] = False
+        return self.observe()
+
+    def observe(self):
+        """
+        Returns:
+            np.ndarray: (size, len(OBSERVATION_FIELDS)) float32 array, one row
+                per player.
+        """
+        return np.stack(
+            [
+                self.x,
+                self.y,
+                self.velocity_x,
+                self.velocity_y,
+                self.on_ground,
+                self.hit,
+                self.coins,
+            ],
+            axis=1,
+        ).astype(np.float32)
+
+    def _overlaps(self, x, y, rects):
+        """(players, rects) mask of which player rects overlap which rects."""
+        return (
+            (x[:, None] < rects[None, :, 2])
+            & (x[:, None] + self.width > rects[None, :, 0])
+            & (y[:, None] < rects[None, :, 3])
+            & (y[:, None] + self.height > rects[None, :, 1])
+        )
+
+    def _touches(self, boxes, rects):
+        """
+        (players, rects) mask of which rects each player touched anywhere in
+        `boxes`, a list of (left, top, right, bottom) arrays with one entry
+        per player.
+        """
+        touched = np.zeros((len(boxes[0][0]), len(rects)), dtype=bool)
+        for left, top, right, bottom in boxes:
+            touched |= (
+                (left[:, None] < rects[None, :, 2])
+                & (right[:, None] > rects[None, :, 0])
+                & (top[:, None] < rects[None, :, 3])
+                & (bottom[:, None] > rects[None, :, 1])
+            )
+        return touched
+
+    def _box(self, start_x, start_y, end_x, end_y):
+        """
+        Area covered by player rects moving in a straight line along one
+        axis, as (left, top, right, bottom) arrays for `_touches`.
+        """
+        return (
+            np.minimum(start_x, end_x),
+            np.minimum(start_y, end_y),
+            np.maximum(start_x, end_x) + self.width,
+            np.maximum(start_y, end_y) + self.height,
+        )
+
+    def _stop_at_first_platform(self, start, moved, across, axis):
+        """
+        Cut each row's move short one pixel into the first platform in its
+        way, as Player._stop_at_first_platform does.
+
+        Args:
+            start (np.ndarray): Positions along the axis before the move.
+            moved (np.ndarray): Positions after it, cut short in place.
+            across (np.ndarray): Positions along the other axis, which the
+                move leaves alone.
+            axis (int): 0 for a move in x, 1 for one in y.
+        """
+        if axis == 0:
+            length, breadth = self.width, self.height
+        else:
+            length, breadth = self.height, self.width
+        # Rows moving no further than their own length can't pass through
+        # anything; see Player._stop_at_first_platform
+        if not len(self.platforms) or not (np.abs(moved - start) > length).any():
+            return
+
+        near = self.platforms[:, axis]
+        far = self.platforms[:, axis + 2]
+        side = self.platforms[:, 1 - axis]
+        other_side = self.platforms[:, 3 - axis]
+        delta = (moved - start)[:, None]
+        start = start[:, None]
+        across = across[:, None]
+        # Pixels between each row's leading edge and each platform ahead
+        gap = np.where(delta > 0, near - (start + length), start - far)
+        in_way = (
+            (delta != 0)
+            & (gap >= 0)
+            & (gap < np.abs(delta))
+            & (across < other_side)
+            & (across + breadth > side)
+        )
+        stop = np.where(in_way, gap + 1, np.abs(delta)).min(axis=1)
+        moved[:] = start[:, 0] + np.sign(delta[:, 0]) * stop
+
+    def _resolve(self, x, y, push):
+        """
+        Push rects out of platforms the way Player.update does: platforms
+        are visited in level order and each one is tested against the rect
+        as the previous pushes left it.
+
+        Rather than visiting every platform, each row jumps straight to the
+        next platform it overlaps. Platforms in between don't overlap the
+        rect where it is, so visiting them would change nothing. Rounds
+        continue until no row overlaps anything further along, which takes
+        as many rounds as the most pushes any one row receives.
+
+        Args:
+            x, y (np.ndarray): Positions, updated in place by `push`.
+            push: Called as push(rows, platforms) with the rows to push and,
+                for each, the (left, top, right, bottom) it overlaps.
+        """
+        rows = np.arange(len(x))
+        cursor = np.zeros(len(x), dtype=np.int32)  # First platform left to visit
+        order = np.arange(len(self.platforms))
+        while len(rows):
+            ahead = self._overlaps(x[rows], y[rows], self.platforms) & (
+                order >= cursor[:, None]
+            )
+            pushed = ahead.any(axis=1)
+            rows, ahead = rows[pushed], ahead[pushed]
+            if not len(rows):
+                break
+            first = ahead.argmax(axis=1)
+            push(rows, self.platforms[first])
+            cursor = first + 1
+
+    def step(self, actions):
+        """
+        Advance every player that hasn't finished by one tick.
+
+        Args:
+            actions (np.ndarray): One int per player, LEFT | RIGHT | JUMP bits
+                as in Input.py.
+
+        Returns:
+            tuple: (observations, rewards, done): the observations from
+                `observe`, coins collected this tick, and which players have
+                reached the flag. Finished players stay put until reset.
+        """
+        actions = np.asarray(actions)
+        live = np.flatnonzero(~self.done)
+
+        x = self.x[live]
+        y = self.y[live]
+        velocity_x = np.zeros(len(live), dtype=np.int32)
+        velocity_y = self.velocity_y[live]
+        carry_x = self.carry_x[live]
+        on_ground = self.on_ground[live]
+        hit = self.hit[live]
+        hit_time = self.hit_time[live]
+        action = actions[live]
+
+        # 1) Knockback: BounceLeft.update drags the player along its arc
+        hit_time[hit] += self.tick_time
+        t = hit_time / self.bounce_duration
+        ended = hit & (t >= 1.0)
+        arc = hit & ~ended
+        t = t[arc]
+        x[arc] = round_like_pygame(
+            self.hit_x[live[arc]] + (-1 * self.bounce_distance) * t
+        )
+        y[arc] = round_like_pygame(
+            self.hit_y[live[arc]]
+            - ((-4 * self.bounce_height) * np.square(t - 0.5) + self.bounce_height)
+        )
+        velocity_x[hit] = -Player.KNOCKBACK_SPEED
+        velocity_y[hit & on_ground] = -Player.JUMP_SPEED
+
+        # 2) Everyone else follows their controls
+        free = ~hit
+        left = free & (action & LEFT != 0)
+        right = free & ~left & (action & RIGHT != 0)
+        velocity_x[left] = -Player.WALK_SPEED
+        velocity_x[right] = Player.WALK_SPEED
+        velocity_y[free & (action & JUMP != 0) & on_ground] = -Player.JUMP_SPEED
+        hit &= ~ended
+
+        # 3) Move and collide in X, along a path contacts are checked against
+        ticks = self.reference_ticks
+        start_x = x.copy()
+        moved = velocity_x * ticks + carry_x
+        x = round_like_pygame(start_x + moved)
+        carry_x = start_x + moved - x
+        self._stop_at_first_platform(start_x, x, y, axis=0)
+        path = [self._box(start_x, y, x, y)]
+        np.clip(x, 0, self.level.world_width - self.width, out=x)
+
+        def push_x(rows, platforms):
+            moving = velocity_x[rows]
+            x[rows] = np.where(
+                moving > 0,
+                platforms[:, 0] - self.width,
+                np.where(moving < 0, platforms[:, 2], x[rows]),
+            )
+
+        self._resolve(x, y, push_x)
+
+        # 4) Move and collide in Y
+        velocity_y += self.gravity * ticks
+        start_y = y
+        y = round_like_pygame(
+            y + velocity_y * ticks + self.gravity * ticks * (1 - ticks) / 2
+        )
+        y[on_ground & (velocity_y > 0) & (y == start_y)] += 1
+        self._stop_at_first_platform(start_y, y, x, axis=1)
+        path.append(self._box(x, start_y, x, y))
+        on_ground[:] = False
+
+        def push_y(rows, platforms):
+            moving = velocity_y[rows]
+            falling = moving > 0
+            rising = moving < 0
+            y[rows] = np.where(
+                falling,
+                platforms[:, 1] - self.height,
+                np.where(rising, platforms[:, 3], y[rows]),
+            )
+            velocity_y[rows[falling | rising]] = 0.0
+            on_ground[rows[falling]] = True
+
+        self._resolve(x, y, push_y)
+
+        floor = self.level.world_height - self.height
+        below = y > floor
+        y[below] = floor
+        velocity_y[below] = 0.0
+        on_ground[below] = True
+
+        # 5) Contacts along the path, against enemies where they are after
+        # this tick
+        path.append(self._box(x, y, x, y))
+        self.enemies.update(ticks)
+        hazards = np.concatenate([self.enemies.rects(), self.hazards])
+        touched = self._touches(path, hazards)
+        # A hazard hits as it is first touched, and again while it is
+        # touched only once the last knockback is over, like Game's contact
+        # handlers
+        struck = (touched & ~(self.touching[live] & hit[:, None])).any(axis=1)
+        self.touching[live] = touched
+        hit |= struck
+        hit_time[struck] = 0.0
+        self.hit_x[live[struck]] = x[struck]
+        self.hit_y[live[struck]] = y[struck]
+
+        collected = self.collected[live]
+        grabbed = self._touches(path, self.coin_rects) & ~collected
+        self.collected[live] = collected | grabbed
+        rewards = np.zeros(self.size, dtype=np.int32)
+        rewards[live] = grabbed.sum(axis=1)
+        self.coins += rewards
+
+        self.x[live] = x
+        self.y[live] = y
+        self.velocity_x[live] = velocity_x
+        self.velocity_y[live] = velocity_y
+        self.carry_x[live] = carry_x
+        self.on_ground[live] = on_ground
+        self.hit[live] = hit
+        self.hit_time[live] = hit_time
+        self.done[live] = self._touches(path, self.flag).any(axis=1)
+        self.ticks += 1
+
+        return self.observe(), rewards, self.done.copy()
@@ -1,8 +1,8 @@
 import os
-import pygame
 from Entity import Entity
 from Camera import Camera
 from OnHitEffect import OnHitEffect
+from Assets import assets
 
 ASSETS_PATH = os.path.join(".", "App", "assets")
 ON_HIT_IMAGE_PATH = os.path.join(ASSETS_PATH, "on_hit", "damage.PNG")
@@ -29,9 +29,7 @@ class BounceLeft(OnHitEffect):
         self.active = False  # Indicates if the effect is active
 
         # Load the on-hit image
-        self.on_hit_image = pygame.transform.scale(
-            pygame.image.load(ON_HIT_IMAGE_PATH), (60, 60)
-        )
+        self.on_hit_image = assets.image(ON_HIT_IMAGE_PATH, (60, 60))
 
         self.animation_time = 10
         self.current_animation_time = 0
@@ -52,13 +50,12 @@ class BounceLeft(OnHitEffect):
 
         self.animation_active = True
 
-    def update(self, delta_time, screen, camera: Camera):
+    def update(self, delta_time):
         """
-        Update the bounce effect and display the on-hit image.
+        Update the bounce effect and advance the on-hit image.
 
         Args:
-            delta_time (float): Time elapsed since the last frame, in seconds.
-            screen (pygame.Surface): The surface to render the effect.
+            delta_time (float): Time simulated by this tick, in seconds.
         """
         if not self.active:
             return
@@ -80,22 +77,6 @@ class BounceLeft(OnHitEffect):
         self.player.rect.y = self.start_pos[1] - vertical_offset
 
         if self.animation_active:
-            on_hit_pos = (
-                self.start_pos[0] - self.on_hit_image.get_width() // 2,
-                self.start_pos[1] - self.on_hit_image.get_height(),
-            )
-
-            on_hit_rect = Entity(
-                on_hit_pos[0],
-                on_hit_pos[1],
-                self.on_hit_image.get_width(),
-                self.on_hit_image.get_height(),
-            )
-
-            on_hit_screen_rect = camera.apply(on_hit_rect)
-
-            screen.blit(self.on_hit_image, (on_hit_screen_rect.x, on_hit_screen_rect.y))
-
             self.current_animation_time += 1
             self.current_animation_time += 1
 
@@ -103,6 +84,47 @@ class BounceLeft(OnHitEffect):
                 self.animation_active = False
                 self.current_animation_time = 0
 
+    def screen_rect(self, camera: Camera):
+        """
+        Where the on-hit image is on screen.
+
+        Args:
+            camera (Camera): The camera object for world-to-screen translation.
+
+        Returns:
+            pygame.Rect: The image's screen rect, or None while it isn't shown.
+        """
+        if not self.active or not self.animation_active:
+            return None
+
+        on_hit_pos = (
+            self.start_pos[0] - self.on_hit_image.get_width() // 2,
+            self.start_pos[1] - self.on_hit_image.get_height(),
+        )
+
+        on_hit_rect = Entity(
+            on_hit_pos[0],
+            on_hit_pos[1],
+            self.on_hit_image.get_width(),
+            self.on_hit_image.get_height(),
+        )
+
+        return camera.apply(on_hit_rect)
+
+    def draw(self, screen, camera: Camera):
+        """
+        Display the on-hit image while its animation is running.
+
+        Args:
+            screen (pygame.Surface): The surface to render the effect.
+            camera (Camera): The camera object for world-to-screen translation.
+        """
+        on_hit_screen_rect = self.screen_rect(camera)
+        if on_hit_screen_rect is None:
+            return
+
+        screen.blit(self.on_hit_image, (on_hit_screen_rect.x, on_hit_screen_rect.y))
+
     def is_active(self):
         """
         Check if the bounce effect is still active.
@@ -1,10 +1,11 @@
 from Entity import Entity
+from Assets import assets
 import os
-import pygame
 
 ASSETS_PATH = os.path.join(".", "App", "assets")
 
 COIN_IMAGE_PATH = os.path.join(ASSETS_PATH, "coin", "coin.PNG")
+COIN_SIZE = 35
 
 
 class Coin(Entity):
@@ -13,7 +14,7 @@ class Coin(Entity):
     When a player collects a coin, it disappears, and the total coin count is updated.
     """
 
-    def __init__(self, x, y, width=35, height=35):
+    def __init__(self, x, y, width=COIN_SIZE, height=COIN_SIZE):
         """
         Initialize the Coin object.
 
@@ -25,9 +26,7 @@ class Coin(Entity):
         """
         super().__init__(x, y, width, height)
         self.collected = False  # Tracks if the coin has been collected
-        self.image = pygame.transform.scale(
-            pygame.image.load(COIN_IMAGE_PATH), (self.rect.width, self.rect.height)
-        )
+        self.image = assets.image(COIN_IMAGE_PATH, (self.rect.width, self.rect.height))
 
     def draw(self, screen, camera):
         """
@@ -42,7 +41,7 @@ class Coin(Entity):
 
     def check_collision(self, player):
         """
-        Check if the player collides with the coin.
+        Check if the player touched the coin anywhere along its last move.
 
         Args:
             player (Player): The player object.
@@ -50,7 +49,7 @@ class Coin(Entity):
         Returns:
             bool: True if collision occurs, False otherwise.
         """
-        if not self.collected and self.rect.colliderect(player.rect):
+        if not self.collected and player.path.contact_time(self.rect) is not None:
             self.collected = True
             return True
         return False
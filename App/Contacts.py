@@ -0,0 +1,69 @@
+from enum import Enum
+
+
+class ContactEvent(Enum):
+    ENTER = "enter"  # The player started touching the entity this tick
+    STAY = "stay"  # It touched it last tick too
+    EXIT = "exit"  # It touched it last tick but not this one
+
+
+class ContactTracker:
+    """
+    Remembers which entities the player touched last tick, so a contact is
+    reported as it begins, on each later tick it lasts and once as it ends,
+    rather than as a fresh hit on every tick of an overlap.
+
+    Handlers subscribe to one event for one type of entity. A type with no
+    handler for an event simply ignores it.
+    """
+
+    def __init__(self):
+        self.handlers = {}  # (entity type, ContactEvent) -> handler
+        self.active = {}  # Entities touched last tick, in the order reached
+        self.events = 0  # Events dispatched to a handler, for F3
+
+    def subscribe(self, entity_type, event, handler):
+        """
+        Call `handler(entity)` whenever `event` happens to an entity of
+        `entity_type`.
+
+        Args:
+            entity_type (type): The entity class, e.g. Enemy.
+            event (ContactEvent): The event to handle.
+            handler: Called with the entity.
+        """
+        self.handlers[(entity_type, event)] = handler
+
+    def update(self, touching):
+        """
+        Compare this tick's contacts with the last tick's and dispatch the
+        events. Exits go first, then enters and stays in the order given.
+
+        Args:
+            touching (list): Entities the player touched this tick, in the
+                order it reached them.
+        """
+        previous = self.active
+        if not touching and not previous:
+            return
+
+        current = dict.fromkeys(touching)
+        for entity in previous:
+            if entity not in current:
+                self._dispatch(ContactEvent.EXIT, entity)
+        for entity in current:
+            if entity in previous:
+                self._dispatch(ContactEvent.STAY, entity)
+            else:
+                self._dispatch(ContactEvent.ENTER, entity)
+        self.active = current
+
+    def _dispatch(self, event, entity):
+        handler = self.handlers.get((type(entity), event))
+        if handler is not None:
+            self.events += 1
+            handler(entity)
+
+    def clear(self):
+        """Forget every contact without reporting exits, e.g. for a new level."""
+        self.active = {}
@@ -0,0 +1,42 @@
+class Culler:
+    """
+    Picks the drawables near the camera viewport so off-screen entities are
+    skipped before any draw work happens.
+    """
+
+    def __init__(self, margin=64):
+        """
+        Initialize the culler.
+
+        Args:
+            margin (int): Extra pixels around the viewport that still count as
+                visible, so sprites don't pop in at the screen edge.
+        """
+        self.margin = margin
+        self.drawn = 0  # Drawables kept during the last call to visible()
+        self.culled = 0  # Drawables skipped during the last call to visible()
+
+    def visible(self, camera, *indexes):
+        """
+        Collect the entities that overlap the padded viewport.
+
+        Args:
+            camera (Camera): The camera whose viewport is being drawn.
+            *indexes (SpatialHash): Drawables to cull, in draw order.
+
+        Returns:
+            list: Visible entities, in the order they should be drawn.
+        """
+        view = camera.rect.inflate(self.margin * 2, self.margin * 2)
+
+        visible = []
+        total = 0
+        for index in indexes:
+            total += len(index)
+            for entity in index.query(view):
+                if view.colliderect(entity.rect):
+                    visible.append(entity)
+
+        self.drawn = len(visible)
+        self.culled = total - self.drawn
+        return visible
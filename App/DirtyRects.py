@@ -0,0 +1,84 @@
+import pygame
+
+
+class DirtyRegions:
+    """
+    Works out which parts of the screen changed since the last frame, so
+    only those need redrawing and sending to the display.
+
+    Each frame the game describes everything that can change on screen as a
+    set of stamps: (key, screen rect, look) for every moving sprite, effect
+    and overlay line. A stamp that appears or disappears between two frames
+    marks its rect dirty, which covers sprites that moved, changed frame,
+    were collected or came into view. Anything that never changes while the
+    camera is still (platforms, world text) needs no stamp.
+    """
+
+    def __init__(self, screen_rect, max_coverage=0.5):
+        """
+        Initialize the tracker.
+
+        Args:
+            screen_rect (pygame.Rect): The whole screen.
+            max_coverage (float): Fraction of the screen past which redrawing
+                it all is cheaper than redrawing the pieces.
+        """
+        self.screen_rect = screen_rect
+        self.max_coverage = max_coverage
+        self.stamps = set()
+        self.camera_position = None  # Camera topleft the stamps were taken at
+        self.redraw = True  # Whether the next frame must be drawn in full
+        self.updated = 0  # Areas redrawn last frame, None for a full redraw
+
+    def invalidate(self):
+        """Draw the next frame in full, e.g. after something else drew over it."""
+        self.redraw = True
+
+    def areas(self, camera, stamps):
+        """
+        Compare this frame's stamps with the last frame's.
+
+        Args:
+            camera (Camera): The camera this frame is drawn with.
+            stamps (set): (key, (x, y, width, height), look) tuples.
+
+        Returns:
+            list: Non-overlapping screen rects to redraw and update, or None
+                when the whole screen has to be: the camera scrolled, the
+                frame was invalidated, or the changes cover too much of it.
+        """
+        changed = self.stamps ^ stamps
+        self.stamps = stamps
+        camera_position = camera.rect.topleft
+        scrolled = camera_position != self.camera_position
+        self.camera_position = camera_position
+
+        if scrolled or self.redraw:
+            self.redraw = False
+            self.updated = None
+            return None
+
+        areas = self._merge(pygame.Rect(rect) for _, rect, _ in changed)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if sum(area.width * area.height for area in areas) > (
+            self.max_coverage * screen_area
+        ):
+            self.updated = None
+            return None
+
+        self.updated = len(areas)
+        return areas
+
+    def _merge(self, rects):
+        # Union overlapping rects so nothing is drawn or sent twice
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect.width or not rect.height:
+                continue
+            overlap = rect.collidelist(merged)
+            while overlap != -1:
+                rect.union_ip(merged.pop(overlap))
+                overlap = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -1,9 +1,9 @@
 import pygame
 from Entity import Entity
+from Assets import assets
 import os
 from enum import Enum
 
-
 ASSETS_PATH = os.path.join(".", "App", "assets")
 
 MOVEMENT_FRAME_PATHS = [
@@ -22,9 +22,6 @@ class EnemyDirection(Enum):
 
 
 class Enemy(Entity):
-
-    FRAMES = [pygame.image.load(path) for path in MOVEMENT_FRAME_PATHS]
-
     def __init__(
         self,
         x,
@@ -48,19 +45,26 @@ class Enemy(Entity):
             bounds (tuple): Bounds for the movement (e.g., (min_x, max_x) for horizontal).
         """
         self.rect = pygame.Rect(x, y, width, height)
+        self.previous_position = self.rect.topleft  # Where the last tick started
         self.trajectory_type = trajectory_type
         self.speed = speed
         self.bounds = bounds
         self.direction = EnemyDirection.LEFT
+        # Fraction of a pixel moved but not yet applied to the rect
+        self.carry = 0.0
 
         self.current_frame_index = 0
         self.frame_timer = 0
         self.frame_delay = 10
 
-        # Scale frames to match the size of rect
-        Enemy.FRAMES = [
-            pygame.transform.scale(frame, (self.rect.width, self.rect.height))
-            for frame in Enemy.FRAMES
+        # Frames scaled to match the size of rect, shared by same-sized enemies
+        self.frames = [
+            assets.image(path, (self.rect.width, self.rect.height))
+            for path in MOVEMENT_FRAME_PATHS
+        ]
+        self.mirrored_frames = [
+            assets.image(path, (self.rect.width, self.rect.height), flip_x=True)
+            for path in MOVEMENT_FRAME_PATHS
         ]
 
     def _reverse_direction(self):
@@ -70,38 +74,48 @@ class Enemy(Entity):
         elif self.direction == EnemyDirection.RIGHT:
             self.direction = EnemyDirection.LEFT
 
-    def update_animation(self):
-        self.frame_timer += 0.5
+    def update_animation(self, ticks=1.0):
+        self.frame_timer += 0.5 * ticks
 
         if self.frame_timer >= self.frame_delay:
             self.frame_timer = 0  # Reset the timer
-            self.current_frame_index = (self.current_frame_index + 1) % len(
-                Enemy.FRAMES
-            )
+            self.current_frame_index = (self.current_frame_index + 1) % len(self.frames)
 
-    def update(self):
+    def update(self, ticks=1.0):
+        """
+        Move along the patrol and advance the animation.
+
+        Args:
+            ticks (float): How many ticks at Player.REFERENCE_TICK_RATE have
+                passed; `speed` is in pixels per one of them.
+        """
+        moved = self.speed * self.direction.value * ticks + self.carry
         if self.trajectory_type == EnemyMovement.HORIZONTAL:
-            self.rect.x += self.speed * self.direction.value
+            start = self.rect.x
+            self.rect.x += moved  # type: ignore
+            self.carry = start + moved - self.rect.x
             if self.bounds:
                 if self.rect.left < self.bounds[0] or self.rect.right > self.bounds[1]:
                     self._reverse_direction()
 
         elif self.trajectory_type == EnemyMovement.VERTICAL:
-            self.rect.y += self.speed * self.direction.value
+            start = self.rect.y
+            self.rect.y += moved  # type: ignore
+            self.carry = start + moved - self.rect.y
             if self.bounds:
                 if self.rect.top < self.bounds[0] or self.rect.bottom > self.bounds[1]:
                     self._reverse_direction()
 
-        self.update_animation()
+        self.update_animation(ticks)
 
     def check_collision(self, player):
-        return self.rect.colliderect(player.rect)
+        return player.path.contact_time(self.rect) is not None
 
     def draw(self, screen, camera):
-        current_frame = Enemy.FRAMES[self.current_frame_index]
-
-        # Flip the frame if the direction is LEFT
+        # Use the mirrored frame if the direction is LEFT
         if self.direction == EnemyDirection.LEFT:
-            current_frame = pygame.transform.flip(current_frame, True, False)
+            current_frame = self.mirrored_frames[self.current_frame_index]
+        else:
+            current_frame = self.frames[self.current_frame_index]
 
         screen.blit(current_frame, camera.apply(self))
@@ -0,0 +1,209 @@
+import numpy as np
+from Enemy import EnemyDirection, EnemyMovement
+
+# Below this many enemies, updating the objects directly beats the fixed
+# cost of a round of array operations
+MIN_BATCH = 32
+
+
+def round_like_pygame(values):
+    """
+    Round floats the way pygame does when they are assigned to a Rect:
+    halves away from zero.
+
+    Args:
+        values (np.ndarray): Float coordinates.
+
+    Returns:
+        np.ndarray: 32-bit ints, the size pygame stores in a Rect.
+    """
+    whole = np.trunc(values)
+    return (whole + np.sign(values) * (np.abs(values - whole) >= 0.5)).astype(np.int32)
+
+
+class EnemySystem:
+    """
+    Moves every enemy in a level in one batched step.
+
+    Positions, speeds, patrol bounds, directions and animation timers live
+    in arrays, one slot per enemy, and `update` applies Enemy.update to all
+    of them at once. The Enemy objects are only brought up to date when
+    something asks for them through `query` (drawing, contacts) or `sync`,
+    so enemies nobody is looking at cost nothing per tick beyond their slot.
+
+    Like a SpatialHash, `query` returns enemies in the order they were
+    given, so it can stand in for one wherever enemies are looked up.
+    With few enemies it calls Enemy.update on each enemy instead.
+    """
+
+    def __init__(self, enemies, batched=None):
+        """
+        Take over updating `enemies`.
+
+        Args:
+            enemies (list): The level's Enemy objects, in level order.
+            batched (bool): Whether to use arrays. By default they are used
+                when there are at least MIN_BATCH enemies.
+        """
+        self.enemies = list(enemies)
+        if batched is None:
+            batched = len(self.enemies) >= MIN_BATCH
+        self.batched = batched
+        if not batched:
+            return
+
+        enemies = self.enemies
+        self.slots = np.arange(len(enemies))
+        self.position = np.array(
+            [enemy.rect.topleft for enemy in enemies], dtype=np.int32
+        ).reshape(-1, 2)
+        self.previous_position = np.array(
+            [enemy.previous_position for enemy in enemies], dtype=np.int32
+        ).reshape(-1, 2)
+        self.size = np.array(
+            [enemy.rect.size for enemy in enemies], dtype=np.int32
+        ).reshape(-1, 2)
+
+        # Movement along one axis: x for horizontal patrols, y for vertical
+        self.axis = np.array(
+            [
+                0 if enemy.trajectory_type == EnemyMovement.HORIZONTAL else 1
+                for enemy in enemies
+            ],
+            dtype=np.intp,
+        )
+        self.extent = self.size[self.slots, self.axis]
+        self.direction = np.array(
+            [enemy.direction.value for enemy in enemies], dtype=np.int32
+        )
+        self.speed = np.array([enemy.speed for enemy in enemies], dtype=np.float64)
+        self.carry = np.array([enemy.carry for enemy in enemies], dtype=np.float64)
+
+        # Patrols without bounds never turn around
+        self.bounded = np.array([bool(enemy.bounds) for enemy in enemies], dtype=bool)
+        self.lower = np.array(
+            [enemy.bounds[0] if enemy.bounds else 0 for enemy in enemies]
+        )
+        self.upper = np.array(
+            [enemy.bounds[1] if enemy.bounds else 0 for enemy in enemies]
+        )
+
+        self.frame_timer = np.array(
+            [enemy.frame_timer for enemy in enemies], dtype=np.float64
+        )
+        self.frame_delay = np.array(
+            [enemy.frame_delay for enemy in enemies], dtype=np.float64
+        )
+        self.frame_index = np.array(
+            [enemy.current_frame_index for enemy in enemies], dtype=np.int32
+        )
+        self.frame_count = np.array(
+            [len(enemy.frames) for enemy in enemies], dtype=np.int32
+        )
+
+        # pygame never reports empty rects as colliding
+        self.solid = (self.size > 0).all(axis=1)
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def update(self, ticks=1.0):
+        """
+        Advance every enemy by one tick, exactly as Enemy.update would.
+
+        Args:
+            ticks (float): Passed on to Enemy.update.
+        """
+        if not self.batched:
+            for enemy in self.enemies:
+                enemy.previous_position = enemy.rect.topleft
+                enemy.update(ticks)
+            return
+
+        self.previous_position[:] = self.position
+
+        start = self.position[self.slots, self.axis]
+        moved = self.speed * self.direction * ticks + self.carry
+        along = round_like_pygame(start + moved)
+        self.carry = start + moved - along
+        self.position[self.slots, self.axis] = along
+
+        # Turn around once past either end of the patrol
+        turning = self.bounded & (
+            (along < self.lower) | (along + self.extent > self.upper)
+        )
+        self.direction[turning] *= -1
+
+        self.frame_timer += 0.5 * ticks
+        advancing = self.frame_timer >= self.frame_delay
+        self.frame_timer[advancing] = 0
+        self.frame_index[advancing] = (
+            self.frame_index[advancing] + 1
+        ) % self.frame_count[advancing]
+
+    def _sync(self, slots):
+        for slot in slots:
+            enemy = self.enemies[slot]
+            x, y = self.position[slot].tolist()
+            enemy.rect.topleft = (x, y)
+            enemy.previous_position = tuple(self.previous_position[slot].tolist())
+            enemy.direction = EnemyDirection(int(self.direction[slot]))
+            enemy.carry = float(self.carry[slot])
+            enemy.frame_timer = float(self.frame_timer[slot])
+            enemy.current_frame_index = int(self.frame_index[slot])
+
+    def sync(self):
+        """
+        Copy every enemy's state back onto its Enemy object, for code that
+        reads them all, like LevelStream saving enemies it evicts.
+        """
+        if self.batched:
+            self._sync(self.slots)
+
+    def query(self, rect):
+        """
+        Find the enemies overlapping `rect`, brought up to date.
+
+        Args:
+            rect (pygame.Rect): Area to search, in world coordinates.
+
+        Returns:
+            list: Enemies whose rects overlap `rect`, in level order.
+        """
+        if not self.batched:
+            return [enemy for enemy in self.enemies if enemy.rect.colliderect(rect)]
+
+        x, y = self.position[:, 0], self.position[:, 1]
+        slots = np.flatnonzero(
+            self.solid
+            & (x < rect.right)
+            & (x + self.size[:, 0] > rect.left)
+            & (y < rect.bottom)
+            & (y + self.size[:, 1] > rect.top)
+        )
+        self._sync(slots)
+        return [self.enemies[slot] for slot in slots]
+
+    def rects(self):
+        """
+        Returns:
+            np.ndarray: (n, 4) left, top, right, bottom of every enemy that can
+                collide, in level order.
+        """
+        if not self.batched:
+            return np.array(
+                [
+                    (
+                        enemy.rect.left,
+                        enemy.rect.top,
+                        enemy.rect.right,
+                        enemy.rect.bottom,
+                    )
+                    for enemy in self.enemies
+                    if enemy.rect.width and enemy.rect.height
+                ],
+                dtype=np.int32,
+            ).reshape(-1, 4)
+
+        corners = self.position[self.solid]
+        return np.concatenate([corners, corners + self.size[self.solid]], axis=1)
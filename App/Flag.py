@@ -1,4 +1,4 @@
-import pygame
+from Assets import assets
 
 
 class Flag:
@@ -13,8 +13,7 @@ class Flag:
             height (int): The height of the flag.
             image_path (str): Path to the flag image.
         """
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (width, height))  # Resize flag
+        self.image = assets.image(image_path, (width, height))  # Resize flag
         self.rect = self.image.get_rect()
         self.rect.topleft = (x, y)
 
@@ -27,3 +26,15 @@ class Flag:
             camera (Camera): The camera object for world-to-screen translation.
         """
         screen.blit(self.image, camera.apply(self.rect))
+
+    def check_collision(self, player):
+        """
+        Check if the player has reached the flag, even in passing.
+
+        Args:
+            player (Player): The player object.
+
+        Returns:
+            bool: True if collision occurs, False otherwise.
+        """
+        return player.path.contact_time(self.rect) is not None
@@ -1,154 +1,107 @@
-from os import walk
+from functools import partial
 import pygame
 from Lava import Lava
 from Spikes import Spikes
-from Player import Player
+from Player import Player, REFERENCE_TICK_RATE
 from Camera import Camera
-from Platform import Platform
-from Enemy import Enemy, EnemyMovement
+from Enemy import Enemy
+from EnemySystem import EnemySystem
 from Coin import Coin
+from Contacts import ContactEvent, ContactTracker
 from Flag import Flag
+from Culling import Culler
+from Loader import AssetLoader
+from DirtyRects import DirtyRegions
+from StaticLayer import StaticLayer
+from Text import TextRenderer
+from Assets import assets
+from Audio import Audio, load_sound
+from Input import ScriptedInput
+from Level import Level, DEFAULT_LEVEL
+from LevelStream import LevelStream
+from Profiler import FrameProfiler
+from Scenes import LoadingScene, PlayScene, Scene
+
+MAX_FRAME_TIME = 0.25  # Seconds of real time one frame may simulate at most
 
 
 class Game:
-    def __init__(self):
+    def __init__(
+        self,
+        level_path=DEFAULT_LEVEL,
+        streaming=False,
+        tick_rate=60,
+        fps=60,
+        headless=False,
+        input_source=None,
+        dirty_rects=False,
+    ):
+        """
+        Initialize the game.
+
+        Args:
+            level_path (str): Path to the level file to play.
+            streaming (bool): Stream the level in chunks, see LevelStream.py.
+            tick_rate (int): Simulation ticks per second. Movement covers the
+                same distance per second at any rate.
+            fps (int): Frames drawn per second, independent of `tick_rate`.
+            headless (bool): Run without a window, audio or drawing, stepping
+                as fast as possible. See `simulate`.
+            input_source: Where the player's controls come from, see Input.py.
+                Defaults to the keyboard, or to no input at all when headless.
+            dirty_rects (bool): Redraw and update only the parts of the screen
+                that changed while the camera is still, rather than the whole
+                screen every frame. See DirtyRects.py.
+        """
+        self.headless = headless
+        if headless and input_source is None:
+            input_source = ScriptedInput(())  # No keyboard without a window
+        self.input_source = input_source
+        self.tick_rate = tick_rate
+        self.tick_time = 1 / tick_rate  # Seconds simulated by each step()
+        self.ticks = 0  # Ticks simulated since the level was loaded
+
+        # What the player's contacts do, as they begin and while they last
+        self.contacts = ContactTracker()
+        for hazard, on_hit in (
+            (Enemy, self._on_enemy_hit),
+            (Lava, self._on_lava),
+            (Spikes, self._on_spikes),
+        ):
+            self.contacts.subscribe(hazard, ContactEvent.ENTER, on_hit)
+            self.contacts.subscribe(
+                hazard, ContactEvent.STAY, partial(self._on_hazard_stay, on_hit)
+            )
+        self.contacts.subscribe(Coin, ContactEvent.ENTER, self._on_coin)
+        self.contacts.subscribe(Flag, ContactEvent.ENTER, self._on_flag)
+
+        # Per-phase frame timings, off until F4 or app.py's --profile. F4 only
+        # shows them on screen; app.py writes them out when given --profile
+        self.profiler = FrameProfiler()
+        self.dirty_regions = None  # Set up with the window if dirty_rects
+
+        self.level = None
+        if headless:
+            # Sprites still load (entities expect them) but nothing is
+            # converted for a display, and no sound is ever played
+            assets.load_atlas()
+            self.audio = Audio(enabled=False)
+            self.load_level(level_path, streaming)
+            return
+
         pygame.init()
         self.screen = pygame.display.set_mode((800, 600))
         self.clock = pygame.time.Clock()
+        self.fps = fps
 
-        self.world_width = 6000  # The width of the game world
-        self.world_height = 600  # The height of the game world
-
-        self.camera = Camera(800, 600, self.world_width, self.world_height)
-
-        self.player = Player(
-            100,
-            800,
-            50,
-            110,
-            self.world_width,
-            self.world_height,
-        )
-
-        self.platforms = [
-            Platform(0, 550, 1900, 50),  # Ground platform
-            Platform(900, 500, 50, 50),
-            Platform(950, 500, 50, 50),
-            Platform(950, 450, 50, 50),
-            Platform(1000, 500, 50, 50),
-            Platform(1000, 450, 50, 50),
-            Platform(1000, 400, 50, 50),
-            Platform(1300, 500, 50, 50),
-            Platform(1500, 500, 50, 50),
-            Platform(2000, 500, 5000, 100),  # Ground platform
-            Platform(2300, 375, 50, 50),
-            Platform(2300, 375, 50, 50),
-            Platform(2350, 375, 50, 50),
-            Platform(2400, 375, 50, 50),
-            Platform(2550, 325, 50, 50),
-            Platform(2600, 325, 50, 50),
-            Platform(2800, 255, 50, 50),
-            Platform(3000, 300, 50, 200),
-            Platform(3250, 350, 50, 150),
-            Platform(3500, 400, 50, 100),
-            Platform(4000, 450, 50, 50),
-            Platform(4050, 450, 50, 50),
-            Platform(4100, 450, 50, 50),
-            Platform(4150, 450, 50, 50),
-            Platform(4200, 450, 50, 50),
-            Platform(4250, 450, 50, 50),
-            Platform(4300, 450, 50, 50),
-            Platform(4350, 450, 50, 50),
-            Platform(4400, 450, 50, 50),
-            Platform(4450, 450, 50, 50),
-            Platform(4675, 450, 50, 50),
-            Platform(4775, 400, 50, 100),
-            Platform(4875, 350, 50, 150),
-            Platform(4975, 300, 50, 200),
-            Platform(5075, 250, 50, 250),
-        ]
-        self.enemies = [
-            Enemy(
-                400, 500, 50, 50, EnemyMovement.HORIZONTAL, speed=2, bounds=(300, 600)
-            ),
-            Enemy(
-                2000,
-                450,
-                50,
-                50,
-                EnemyMovement.HORIZONTAL,
-                speed=7,
-                bounds=(2000, 2700),
-            ),
-            Enemy(
-                3050,
-                450,
-                50,
-                50,
-                EnemyMovement.HORIZONTAL,
-                speed=4,
-                bounds=(3050, 3250),
-            ),
-            Enemy(
-                3300,
-                450,
-                50,
-                50,
-                EnemyMovement.HORIZONTAL,
-                speed=6,
-                bounds=(3300, 3500),
-            ),
-            Enemy(
-                4000,
-                400,
-                50,
-                50,
-                EnemyMovement.HORIZONTAL,
-                speed=5,
-                bounds=(4000, 4200),
-            ),
-            Enemy(
-                4300,
-                400,
-                50,
-                50,
-                EnemyMovement.HORIZONTAL,
-                speed=4,
-                bounds=(4300, 4500),
-            ),
-        ]
-        self.lava_pools = [
-            Lava(1900, 575, 100, 25),
-            Lava(4500, 485, 175, 15),
-        ]
-        self.coins = [
-            Coin(650, 500),
-            Coin(1100, 200),
-            Coin(2800, 200),
-            Coin(3125, 170),
-            Coin(3375, 230),
-            Coin(4675, 400),
-            Coin(4775, 350),
-            Coin(4875, 300),
-            Coin(4975, 250),
-            Coin(5075, 200),
-        ]
-
-        self.total_coins_collected = 0
-
-        self.spike_traps = [
-            Spikes(1050, 530, 50, 20, 4),
-            Spikes(1350, 530, 150, 20, 10),
-            Spikes(2550, 305, 30, 20, 3),
-            Spikes(3620, 480, 100, 20, 5),
-            Spikes(4725, 480, 50, 20, 3),
-            Spikes(4825, 480, 50, 20, 3),
-            Spikes(4925, 480, 50, 20, 3),
-            Spikes(5025, 480, 50, 20, 3),
-        ]
+        # Fonts are resolved once loaded; rendered lines are cached between
+        # frames
+        self.text = TextRenderer()
+        self.font = self.hud_font = self.title_font = None
+        self.coin_text = None  # HUD counter, re-rendered when the count changes
+        self.coin_text_count = None
 
-        # Font and text for how to play
-        self.font = pygame.font.SysFont("Comic Sans MS", 16)  # Default font, size 36
+        # Text for how to play
         self.text_color = (0, 0, 0)  # Black color
         self.how_to_play_text = [
             "def how_to_play():",
@@ -161,64 +114,148 @@ class Game:
         ]
         self.text_rect = pygame.Rect(40, 50, 0, 0)  # Position in world coordinates
 
-        # Load background music
-        pygame.mixer.music.load("App/Sounds/Cute_Circus.mp3")
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1, 0.0)  # Play music indefinitely
+        # Sound effects for collision events, decoded once and cached
+        self.audio = Audio(load=False)
+
+        self.culler = Culler(margin=64)
+        if dirty_rects:
+            self.dirty_regions = DirtyRegions(self.screen.get_rect())
+        self.updated_areas = None  # Areas the last render drew, None for all
+        self.show_debug = False
+        self.profile_lines = []  # Overlay text, refreshed every few frames
+        self.profile_lines_frame = None
+
+        self.running = True  # Until the window is closed or Quit is picked
+        self.scene = Scene(self)  # Shows nothing until the loading screen below
+
+        # Files are read and decoded on a worker thread while a loading
+        # screen is up. Play starts once the sprites, fonts and level are
+        # in; sound effects keep arriving after that.
+        self.loader = AssetLoader()
+        self.loader.add("sprites", assets.read_atlas, assets.use_atlas)
+        self.loader.add("fonts", self._find_fonts, self._use_fonts)
+        if streaming:
+            # Streamed levels read their chunks as the camera reaches them
+            self.loader.add("level", None, lambda _: self.load_level(level_path, True))
+        else:
+            self.loader.add(
+                "level",
+                lambda: Level.load_compiled(level_path),
+                lambda compiled: self._use_level(level_path, compiled),
+            )
+        self.loader.add("music", None, lambda _: self.audio.start_music())
+        for name in self.audio.effects:
+            self.loader.add(
+                f"sound: {name}",
+                partial(load_sound, self.audio.path(name)),
+                partial(self.audio.add_sound, name),
+            )
+        self.loader.start()
+        self.switch_scene(
+            LoadingScene(self, ("sprites", "fonts", "level", "music"), PlayScene(self))
+        )
+
+    def _find_fonts(self):
+        # Searching the system's fonts is the slow part; opening one is quick
+        pygame.font.match_font("Comic Sans MS")
+
+    def _use_fonts(self, _):
+        self.font = self.text.font("Comic Sans MS", 16)
+        self.hud_font = self.text.font("Comic Sans MS", 18)
+        self.title_font = self.text.font("Comic Sans MS", 48)
+
+    def _use_level(self, level_path, compiled):
+        self.level_path = level_path
+        self.streaming = False
+        self.set_level(Level(*compiled))
 
-        # Load sound effects for collision events
-        self.lava_sound = pygame.mixer.Sound("App/Sounds/windows_startup.mp3")
-        self.enemy_sound = pygame.mixer.Sound("App/Sounds/enemy_collide.mp3")
-        self.spike_sound = pygame.mixer.Sound("App/Sounds/spikes_collide.mp3")
-        self.coin_sound = pygame.mixer.Sound("App/Sounds/coin.mp3")
-        self.resume_music = False  # Flag to track music resumption
+    def wait_until_loaded(self):
+        """
+        Block until every asset has loaded and skip the loading screen, for
+        scripts that drive `frame` themselves.
+        """
+        self.loader.wait()
+        if isinstance(self.scene, LoadingScene):
+            self.switch_scene(self.scene.then)
 
-        # Load flag
-        self.flag = Flag(5400, 150, 70, 350, "App/assets/ending/samu_flag.png")
+    def load_level(self, level_path, streaming=False):
+        """
+        Replace the current level with the one in `level_path`.
 
-    def _end_game_sequence(self):
+        Args:
+            level_path (str): Path to a level file, see Level.py.
+            streaming (bool): Keep only the chunks near the camera loaded,
+                for levels too long to hold in memory. See LevelStream.py.
         """
-        Gradually dims the screen to black and displays "FIN!"
-        and the number of coins collected out of the total.
+        self.level_path = level_path
+        self.streaming = streaming
+        if streaming:
+            level = LevelStream.open(level_path)
+        else:
+            level = Level.load(level_path)
+        self.set_level(level)
+
+    def set_level(self, level):
         """
-        fade_surface = pygame.Surface(self.screen.get_size())
-        fade_surface.fill((0, 0, 0))
+        Start playing an already loaded level from the beginning.
 
-        # We'll do a simple fade up to alpha=255
-        for alpha in range(0, 256, 5):
-            # Re-draw the last frame (so the current scene is visible under the fade)
-            self.screen.blit(self.screen, (0, 0))
+        Args:
+            level (Level | LevelStream): The level; it must not have been
+                played before, as collected coins and moved enemies stay
+                that way.
+        """
+        if isinstance(self.level, LevelStream) and self.level is not level:
+            self.level.close()
 
-            # Set the alpha (opacity) of the fade overlay
-            fade_surface.set_alpha(alpha)
-            self.screen.blit(fade_surface, (0, 0))
+        self.world_width = level.world_width  # The width of the game world
+        self.world_height = level.world_height  # The height of the game world
 
-            pygame.display.flip()
-            self.clock.tick(60)
-
-        # Once fully faded, show final text
-        self.screen.fill((0, 0, 0))
-
-        # Display the "FIN!" text
-        font = pygame.font.SysFont("Comic Sans MS", 48)
-        fin_text = font.render("FIN!", True, (255, 255, 255))
-        fin_rect = fin_text.get_rect(center=(self.screen.get_width() // 2, 200))
-        self.screen.blit(fin_text, fin_rect)
-
-        # Display the coin summary
-        coin_summary_text = font.render(
-            f"Coins: {self.total_coins_collected}/{len(self.coins)}",
-            True,
-            (255, 255, 255),
-        )
-        coin_summary_rect = coin_summary_text.get_rect(
-            center=(self.screen.get_width() // 2, 300)
+        self.camera = Camera(800, 600, self.world_width, self.world_height)
+
+        x, y, width, height = level.player_start
+        self.player = Player(
+            x,
+            y,
+            width,
+            height,
+            self.world_width,
+            self.world_height,
+            self.input_source,
         )
-        self.screen.blit(coin_summary_text, coin_summary_rect)
 
-        pygame.display.flip()
+        # Entity lists; with a streamed level these hold only what is loaded
+        self.platforms = level.platforms
+        self.enemies = level.enemies
+        self.lava_pools = level.lava_pools
+        self.coins = level.coins
+        self.spike_traps = level.spike_traps
+        self.flag = level.flag
+        self.coin_count = level.coin_count
+
+        # Prebuilt indexes: platforms for player collisions, triggers for
+        # contacts, sprites for culling. Enemies move, so they are looked up
+        # through the enemy system instead.
+        self.platform_index = level.platform_index
+        self.triggers = level.triggers
+        self.sprites = level.sprites
 
-        pygame.time.wait(10000)
+        self.total_coins_collected = 0
+        self.level_complete = False
+        self.ticks = 0
+        self.accumulator = 0.0  # Real time not yet simulated
+        self.contacts.clear()
+
+        # Geometry that never moves is baked into chunk surfaces. Everything
+        # else is culled against the viewport; F3 shows the counts.
+        self.static_layer = StaticLayer(level.static_index, self.world_height)
+        self.level = level
+        if self.dirty_regions is not None:
+            self.dirty_regions.invalidate()
+
+        # Bring in whatever is around the player before the first frame
+        self.camera.update(self.player)
+        self.level.update(self.camera)
+        self.enemy_system = EnemySystem(self.enemies)
 
     def draw_world_text(self, screen, camera):
         """
@@ -231,7 +268,7 @@ class Game:
         y_offset = 0  # Vertical offset between text lines
         for line in self.how_to_play_text:
             # Render each line of text
-            text_surface = self.font.render(line, True, self.text_color)
+            text_surface = self.text.render(self.font, line, self.text_color)
 
             # Adjust the position of the text to account for the camera
             text_position = self.text_rect.move(
@@ -248,80 +285,384 @@ class Game:
 
             y_offset += 30  # Move down for the next line
 
-    def start(self, mode="standard"):
+    def _on_enemy_hit(self, enemy):
+        self.audio.play("enemy")
+        self.player.bounce_effect.start(self.player)
+
+    def _on_lava(self, lava):
+        self.player.bounce_effect.start(
+            self.player,
+        )
+        # The lava sound plays over paused music, which resumes after it
+        self.audio.interrupt_music("lava")
+
+    def _on_spikes(self, spikes):
+        self.audio.play("spikes")
+        self.player.bounce_effect.start(
+            self.player,
+        )
+
+    def _on_coin(self, coin):
+        coin.collected = True
+        self.total_coins_collected += 1
+        self.audio.play("coin")
+        # Collected coins can't be touched or seen again
+        self.triggers.remove(coin)
+        self.sprites.remove(coin)
+
+    def _on_hazard_stay(self, on_hit, hazard):
+        # Staying on a hazard only hurts again once the knockback from the
+        # last hit is over, instead of restarting it every tick
+        if not self.player.bounce_effect.is_active():
+            on_hit(hazard)
+
+    def _on_flag(self, flag):
+        self.level_complete = True
+
+    def handle_contacts(self):
+        """
+        Ask the broadphase what the player touched along its path this tick
+        and hand them to the contact tracker, in the order the player reached
+        them. Hits at the same moment go in the order the entities were
+        registered, enemies first, as they are in the level file.
+        """
+        path = self.player.path
+        area = path.area
+        contacts = []  # (when along the path, entity)
+        for entity in [*self.enemy_system.query(area), *self.triggers.query(area)]:
+            time = path.contact_time(entity.rect)
+            if time is not None:
+                contacts.append((time, entity))
+        # Sorted on the time alone, so ties keep their order
+        contacts.sort(key=lambda contact: contact[0])
+        self.contacts.update([entity for _, entity in contacts])
+
+    def step(self):
+        """
+        Advance the simulation by one fixed tick of `tick_time` seconds.
+        """
+        profiler = self.profiler
+        self.player.previous_position = self.player.rect.topleft
+        ticks = self.tick_time * REFERENCE_TICK_RATE
+        self.player.update(self.tick_time, self.platform_index)
+        profiler.lap("player")
+
+        self.enemy_system.update(ticks)
+        profiler.lap("enemies")
+
+        self.handle_contacts()
+        self.ticks += 1
+        profiler.lap("contacts")
+
+        self.audio.update(self.tick_time)
+        profiler.lap("audio")
+
+        self.camera.update(self.player)
+        level = self.level
+        assert level is not None, "a level is set before the first step"
+        self.enemies_changed = False
+        for left, right in level.update(self.camera, self._before_level_change):
+            self.static_layer.invalidate_area(left, right)
+        if self.enemies_changed:
+            self.enemy_system = EnemySystem(self.enemies)
+        profiler.lap("level")
+
+    def _before_level_change(self):
+        # A streamed level saves enemies it evicts from their objects, so
+        # bring them up to date; the system is rebuilt for the new set after
+        self.enemy_system.sync()
+        self.enemies_changed = True
+
+    def _interpolate(self, entity, alpha):
+        """
+        Move an entity to where it is `alpha` of the way through the current
+        tick, returning its real position so it can be put back afterwards.
+        """
+        position = entity.rect.topleft
+        previous_x, previous_y = entity.previous_position
+        entity.rect.topleft = (
+            round(previous_x + (position[0] - previous_x) * alpha),
+            round(previous_y + (position[1] - previous_y) * alpha),
+        )
+        return position
+
+    def render(self, alpha):
+        """
+        Draw the current frame, with moving entities placed between their
+        last two simulated positions.
+
+        With dirty rects on, only the parts of the screen that changed since
+        the last frame are redrawn, and `updated_areas` lists them for the
+        display update; it is None when the whole screen was drawn.
+
+        Args:
+            alpha (float): How far the frame is between the last tick and the
+                next one, from 0 to 1.
+        """
+        profiler = self.profiler
+        player_position = self._interpolate(self.player, alpha)
+        self.camera.update(self.player)
+        profiler.lap("clear")
+
+        visible = self.culler.visible(self.camera, self.enemy_system, self.sprites)
+        enemy_positions = [
+            (entity, self._interpolate(entity, alpha))
+            for entity in visible
+            if isinstance(entity, Enemy)
+        ]
+        profiler.lap("sprites")
+
+        overlays = self._overlays()
+        profiler.lap("hud")
+
+        self.updated_areas = None
+        if self.dirty_regions is not None:
+            self.updated_areas = self.dirty_regions.areas(
+                self.camera, self._stamps(visible, overlays)
+            )
+
+        if self.updated_areas is None:
+            self._draw_scene(visible, overlays)
+        else:
+            for area in self.updated_areas:
+                self.screen.set_clip(area)
+                self._draw_scene(visible, overlays)
+            self.screen.set_clip(None)
+
+        for entity, position in enemy_positions:
+            entity.rect.topleft = position
+        self.player.rect.topleft = player_position
+
+    def _draw_scene(self, visible, overlays):
+        """
+        Draw everything, back to front, within the screen's clip area.
+
+        Args:
+            visible (list): Culled sprites, already interpolated.
+            overlays (list): (surface, position) pairs drawn on top.
+        """
+        profiler = self.profiler
+        self.screen.fill((255, 255, 255))
+        self.player.bounce_effect.draw(self.screen, self.camera)
+        profiler.lap("clear")
+
+        self.draw_world_text(self.screen, self.camera)
+        profiler.lap("text")
+
+        self.player.draw(self.screen, self.camera)
+        profiler.lap("draw_player")
+
+        self.static_layer.draw(self.screen, self.camera)
+        profiler.lap("static")
+
+        for entity in visible:
+            entity.draw(self.screen, self.camera)
+        profiler.lap("sprites")
+
+        for surface, position in overlays:
+            self.screen.blit(surface, position)
+        profiler.lap("hud")
+
+    def _stamps(self, visible, overlays):
+        """
+        Describe everything on screen that can change while the camera is
+        still, for DirtyRegions.
+        """
+        camera = self.camera
+        image = self.player.current_image()
+        player_rect = image.get_rect(topleft=camera.apply(self.player).topleft)
+        # (what, where on screen, what it looks like if that can change alone)
+        stamps: set[tuple[str | int, tuple[int, ...], object]] = {
+            ("player", tuple(player_rect), id(image))
+        }
+
+        hit_rect = self.player.bounce_effect.screen_rect(camera)
+        if hit_rect is not None:
+            stamps.add(("hit", tuple(hit_rect), None))
+
+        for entity in visible:
+            look = None
+            if isinstance(entity, Enemy):
+                look = (entity.current_frame_index, entity.direction)
+            stamps.add((id(entity), tuple(camera.apply(entity.rect)), look))
+
+        for surface, position in overlays:
+            stamps.add((id(surface), (*position, *surface.get_size()), None))
+        return stamps
+
+    def _overlays(self):
+        """
+        Returns:
+            list: (surface, screen position) of the HUD and any debug text.
+        """
+        coin_text = self.coin_text
+        if coin_text is None or self.coin_text_count != self.total_coins_collected:
+            coin_text = self.coin_text = self.text.render(
+                self.hud_font,
+                f"Samu's coins: {self.total_coins_collected}",
+                (0, 0, 0),
+            )
+            self.coin_text_count = self.total_coins_collected
+        overlays = [(coin_text, (630, 20))]  # Top-right
+
+        if self.show_debug:
+            updated = ""
+            if self.dirty_regions is not None:
+                updated = self.dirty_regions.updated
+                updated = f"  dirty: {'all' if updated is None else updated}"
+            cull_text = self.text.render(
+                self.font,
+                f"drawn: {self.culler.drawn}  culled: {self.culler.culled}  "
+                f"chunks: {self.static_layer.blitted}{updated}  "
+                f"contacts: {len(self.contacts.active)} "
+                f"({self.contacts.events} events)",
+                (0, 0, 0),
+            )
+            overlays.append((cull_text, (10, 10)))
+
+            asset_stats = assets.stats()
+            asset_text = self.text.render(
+                self.font,
+                f"images: {asset_stats['loads']} decoded, "
+                f"{asset_stats['mapped']} mapped in "
+                f"{asset_stats['load_time'] * 1000:.0f}ms, "
+                f"{asset_stats['scales']} scaled, {asset_stats['hits']} shared; "
+                f"sounds: {self.audio.cached}/{len(self.audio.sounds)} cached, "
+                f"{self.audio.skipped} skipped",
+                (0, 0, 0),
+            )
+            overlays.append((asset_text, (10, 30)))
+
+        if self.profiler.enabled:
+            for line_number, line in enumerate(self._profile_lines()):
+                line_text = self.text.render(self.font, line, (0, 0, 0))
+                overlays.append((line_text, (10, 50 + line_number * 20)))
+        return overlays
+
+    def _profile_lines(self):
+        """
+        Recent frame times and the phases taking the most of them, shown
+        below the F3 counters.
+        """
+        # Re-rendering every frame would cost more than most phases
+        frames = self.profiler.frames
+        if self.profile_lines_frame is None or frames - self.profile_lines_frame >= 30:
+            self.profile_lines_frame = frames
+            summary = self.profiler.summary()
+            if summary is None:
+                return self.profile_lines
+            top = "  ".join(
+                f"{phase} {time:.2f}" for phase, time in summary["phases"][:3]
+            )
+            self.profile_lines = [
+                f"frame: {summary['mean']:.2f} ms mean, {summary['max']:.2f} ms "
+                f"worst over {summary['frames']} frames",
+                f"worst frame: {summary['worst_phase']} "
+                f"{summary['worst_phase_time']:.2f} ms",
+                f"slowest phases (ms): {top}",
+            ]
+        return self.profile_lines
+
+    def simulate(self, max_ticks=None):
+        """
+        Step the world back to back, without waiting on a clock or drawing,
+        until the level is complete.
+
+        Args:
+            max_ticks (int): Stop after this many ticks even if the level
+                isn't complete. None runs until it is.
+
+        Returns:
+            int: The number of ticks simulated.
+        """
+        ticks = 0
+        while not self.level_complete and (max_ticks is None or ticks < max_ticks):
+            self.step()
+            ticks += 1
+        return ticks
+
+    def start(self, mode=None):
+        """
+        Run the game.
+
+        Args:
+            mode (str): "standard" opens the window and plays in real time,
+                "headless" runs `simulate` instead. Defaults to "headless" for
+                a game created with `headless=True`, otherwise "standard".
+        """
+        if mode is None:
+            mode = "headless" if self.headless else "standard"
+        if mode == "headless":
+            self.simulate()
+            return
+        if mode != "standard":
+            raise ValueError(f"Unknown mode: {mode}")
+        if self.headless:
+            raise ValueError("A headless game can only run in headless mode")
+
         running = True
         while running:
-            delta_time = self.clock.tick(60) / 1000.0
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-            self.screen.fill((255, 255, 255))
-
-            self.player.update(delta_time, self.platforms, self.screen, self.camera)
-
-            self.player.update_animation()
-
-            self.camera.update(self.player)
-
-            self.draw_world_text(self.screen, self.camera)
-
-            self.player.draw(self.screen, self.camera)
-
-            for platform in self.platforms:
-                platform.draw(self.screen, self.camera)
-
-            for enemy in self.enemies:
-                enemy.update()
-                if enemy.check_collision(self.player):
-                    self.enemy_sound.play()
-                    self.player.bounce_effect.start(self.player)
-                enemy.draw(self.screen, self.camera)
-
-            for lava in self.lava_pools:
-                lava.draw(self.screen, self.camera)
-                if lava.check_collision(self.player):
-                    self.player.bounce_effect.start(
-                        self.player,
-                    )
-                    if (
-                        not self.lava_sound.get_num_channels()
-                    ):  # Play sound only if not already playing
-                        pygame.mixer.music.pause()  # Pause the background music
-                        self.lava_sound.play()
-                        self.resume_music = True  # Set flag to resume music
-
-            if self.resume_music and not pygame.mixer.get_busy():
-                pygame.mixer.music.unpause()
-                self.resume_music = False
-
-            for spikes in self.spike_traps:
-                spikes.draw(self.screen, self.camera)
-                if spikes.check_collision(self.player):
-                    self.spike_sound.play()
-                    self.player.bounce_effect.start(
-                        self.player,
-                    )
-
-            for coin in self.coins:
-                coin.draw(self.screen, self.camera)
-                if coin.check_collision(self.player):
-                    self.total_coins_collected += 1
-                    self.coin_sound.play()
-
-            font = pygame.font.SysFont("Comic Sans MS", 18)
-            coin_text = font.render(
-                f"Samu's coins: {self.total_coins_collected}", True, (0, 0, 0)
-            )  # White text
-            self.screen.blit(coin_text, (630, 20))  # Position text at the top-right
-
-            # Draw the flag
-            self.flag.draw(self.screen, self.camera)
-
-            # Check collision with the flag
-            if self.player.rect.colliderect(self.flag.rect):
-                self._end_game_sequence()
-                running = False
+            # Long stalls (dragging the window, a debugger) are not worth
+            # catching up on tick by tick
+            frame_time = min(self.clock.tick(self.fps) / 1000.0, MAX_FRAME_TIME)
+            running = self.frame(frame_time)
+
+    def switch_scene(self, scene):
+        """
+        Show another scene from the next frame on, see Scenes.py.
 
+        Args:
+            scene (Scene): The scene to switch to.
+        """
+        self.scene = scene
+        scene.enter()
+
+    def restart(self):
+        """Play the current level again from the beginning."""
+        # A recording should only hold the attempt it ends with
+        restart_input = getattr(self.input_source, "restart", None)
+        if restart_input is not None:
+            restart_input()
+        self.load_level(self.level_path, self.streaming)
+        self.switch_scene(PlayScene(self))
+
+    def stop(self):
+        """End the game after the current frame."""
+        self.running = False
+
+    def frame(self, frame_time):
+        """
+        Handle events, then update and draw the current scene for one frame.
+
+        Args:
+            frame_time (float): Real seconds since the last frame.
+
+        Returns:
+            bool: False once the game should stop.
+        """
+        self.profiler.begin_frame()
+        self.loader.poll()  # Hand over anything loaded since the last frame
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.stop()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_debug = not self.show_debug
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.toggle()
+            elif event.type == pygame.WINDOWEXPOSED and self.dirty_regions:
+                self.dirty_regions.invalidate()  # Uncovered parts need drawing
+            else:
+                self.scene.handle_event(event)
+        self.profiler.lap("events")
+
+        self.scene.update(frame_time)
+        updated_areas = self.scene.draw()
+
+        if updated_areas is None:
             pygame.display.flip()
+        else:
+            pygame.display.update(updated_areas)
+        self.profiler.lap("flip")
+        self.profiler.end_frame()
+        return self.running
@@ -0,0 +1,85 @@
+from collections import namedtuple
+import pygame
+
+# What the player asked for on one tick
+Controls = namedtuple("Controls", ["left", "right", "jump"])
+
+NO_CONTROLS = Controls(False, False, False)
+
+# Controls packed into bits, as stored in run files and batch actions
+LEFT, RIGHT, JUMP = 1, 2, 4
+
+
+def encode(controls):
+    """
+    Args:
+        controls (Controls): Controls for one tick.
+
+    Returns:
+        int: The controls as LEFT | RIGHT | JUMP bits.
+    """
+    return (
+        (LEFT if controls.left else 0)
+        | (RIGHT if controls.right else 0)
+        | (JUMP if controls.jump else 0)
+    )
+
+
+def decode(bits):
+    """
+    Args:
+        bits (int): Controls as LEFT | RIGHT | JUMP bits.
+
+    Returns:
+        Controls: The unpacked controls.
+    """
+    return Controls(bool(bits & LEFT), bool(bits & RIGHT), bool(bits & JUMP))
+
+
+class KeyboardInput:
+    """
+    Reads the controls from the keyboard: arrows or A/D to move, space to jump.
+    """
+
+    def poll(self):
+        """
+        Returns:
+            Controls: The keys held down right now.
+        """
+        keys = pygame.key.get_pressed()
+        return Controls(
+            keys[pygame.K_LEFT] or keys[pygame.K_a],
+            keys[pygame.K_RIGHT] or keys[pygame.K_d],
+            keys[pygame.K_SPACE],
+        )
+
+
+class ScriptedInput:
+    """
+    Feeds controls from code instead of a keyboard, for headless runs.
+    """
+
+    def __init__(self, script):
+        """
+        Initialize the scripted input.
+
+        Args:
+            script: Either a callable taking the tick number and returning
+                Controls, or a sequence of Controls, one per tick. Once a
+                sequence runs out, nothing is pressed.
+        """
+        self.script = script
+        self.tick = 0
+
+    def poll(self):
+        """
+        Returns:
+            Controls: The controls for the current tick.
+        """
+        tick = self.tick
+        self.tick += 1
+        if callable(self.script):
+            return self.script(tick)
+        if tick < len(self.script):
+            return self.script[tick]
+        return NO_CONTROLS
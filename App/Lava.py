@@ -33,7 +33,7 @@ class Lava(Entity):
 
     def check_collision(self, player):
         """
-        Check if the player collides with the lava.
+        Check if the player touched the lava anywhere along its last move.
 
         Args:
             player (Player): The player object.
@@ -41,4 +41,4 @@ class Lava(Entity):
         Returns:
             bool: True if collision occurs, False otherwise.
         """
-        return self.rect.colliderect(player.rect)
+        return player.path.contact_time(self.rect) is not None
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import pickle
+from contextlib import contextmanager
+from Coin import Coin
+from Enemy import Enemy, EnemyMovement
+from Entity import Entity
+from Flag import Flag
+from Lava import Lava
+from Platform import Platform
+from SpatialIndex import SpatialHash
+from Spikes import Spikes
+
+LEVELS_PATH = os.path.join(".", "App", "levels")
+DEFAULT_LEVEL = os.path.join(LEVELS_PATH, "level1.json")
+CACHE_PATH = os.path.join(LEVELS_PATH, "__levelcache__")
+
+# Bump whenever the compiled layout changes so old caches are ignored
+CACHE_VERSION = 1
+
+# What reading a missing, stale or corrupt cache can raise
+CACHE_ERRORS = (
+    OSError,
+    pickle.UnpicklingError,
+    EOFError,
+    ValueError,
+    TypeError,
+    AttributeError,
+)
+
+PLATFORM_CELL_SIZE = 128
+STATIC_CELL_SIZE = 512  # One cell per StaticLayer chunk
+TRIGGER_CELL_SIZE = 256
+
+
+class Level:
+    """
+    Entities for one level, built from a level file.
+
+    Level files are JSON (see levels/level1.json). The first load compiles
+    the file into a pickled cache next to it, keyed by a hash of the source,
+    which also holds the collision and render indexes already bucketed.
+    Later loads read the cache and skip parsing and indexing entirely.
+    """
+
+    def __init__(self, records, platform_snapshot, static_snapshot):
+        """
+        Build the level's entities from compiled records.
+
+        Args:
+            records (dict): Compiled level data, see `compile_level`.
+            platform_snapshot (tuple): Snapshot of the platform collision index.
+            static_snapshot (tuple): Snapshot of the static geometry render index.
+        """
+        self.world_width = records["world_width"]
+        self.world_height = records["world_height"]
+        # x, y, width and height the player starts with
+        self.player_start: tuple[int, int, int, int] = records["player"]
+
+        self.platforms = [Platform(*rect) for rect in records["platforms"]]
+        self.enemies = [
+            Enemy(x, y, width, height, EnemyMovement(movement), speed, bounds)
+            for (x, y, width, height), movement, speed, bounds in records["enemies"]
+        ]
+        self.lava_pools = [Lava(*rect) for rect in records["lava"]]
+        self.spike_traps = [Spikes(*spikes) for spikes in records["spikes"]]
+        self.coins = [Coin(x, y) for x, y in records["coins"]]
+        self.flag = Flag(*records["flag"])
+
+        self.platform_index = SpatialHash.from_snapshot(
+            self.platforms, platform_snapshot
+        )
+        self.static_index = SpatialHash.from_snapshot(
+            [*self.platforms, *self.lava_pools, *self.spike_traps], static_snapshot
+        )
+        self.coin_count = len(self.coins)
+
+        # Everything else the player can touch, in the order contacts are
+        # handled. Enemies move, so EnemySystem looks them up instead.
+        self.triggers = SpatialHash.from_entities(
+            [*self.lava_pools, *self.spike_traps, *self.coins, self.flag],
+            cell_size=TRIGGER_CELL_SIZE,
+        )
+        # Entities other than enemies drawn as sprites rather than baked into
+        # the static layer
+        self.sprites = SpatialHash.from_entities(
+            [*self.coins, self.flag], cell_size=TRIGGER_CELL_SIZE
+        )
+
+    def update(self, camera, before_change=None):
+        """
+        Keep the level in step with the camera. A fully loaded level never
+        changes, see LevelStream for one that does.
+
+        Args:
+            camera (Camera): The game camera.
+            before_change: Called with no arguments just before any entity is
+                loaded or evicted.
+
+        Returns:
+            list: (left, right) world x ranges whose static geometry changed.
+        """
+        return []
+
+    @classmethod
+    def load(cls, path=DEFAULT_LEVEL):
+        """
+        Load a level file, compiling it first if there's no up-to-date cache.
+
+        Args:
+            path (str): Path to the level's JSON file.
+
+        Returns:
+            Level: The loaded level.
+        """
+        return cls(*cls.load_compiled(path))
+
+    @staticmethod
+    def load_compiled(path=DEFAULT_LEVEL):
+        """
+        Read a level's compiled form, compiling it first if needed.
+
+        Every `Level(*compiled)` built from the result is a fresh copy of the
+        level, which is cheaper than loading the file again for each one.
+
+        Args:
+            path (str): Path to the level's JSON file.
+
+        Returns:
+            tuple: (records, platform_snapshot, static_snapshot), see Level.
+        """
+        source, cache_file_path = read_level_source(path, ".lvl")
+
+        try:
+            with open(cache_file_path, "rb") as cache_file:
+                version, compiled = pickle.load(cache_file)
+            if version == CACHE_VERSION:
+                return compiled
+        except CACHE_ERRORS:
+            pass  # Missing, stale or corrupt: compile the JSON again
+
+        compiled = compile_level(json.loads(source))
+        with write_cache(cache_file_path) as cache_file:
+            pickle.dump((CACHE_VERSION, compiled), cache_file, pickle.HIGHEST_PROTOCOL)
+        return compiled
+
+
+def read_level_source(path, suffix):
+    """
+    Read a level file and work out where its compiled cache lives.
+
+    Args:
+        path (str): Path to the level's JSON file.
+        suffix (str): Extension of the compiled format, e.g. ".lvl".
+
+    Returns:
+        tuple: (source bytes, cache file path keyed by the source's hash).
+    """
+    with open(path, "rb") as source_file:
+        source = source_file.read()
+
+    digest = hashlib.sha1(source).hexdigest()
+    # Levels with the same file name in different folders get their own
+    # caches, so compiling one never deletes the other's
+    location = hashlib.sha1(os.path.realpath(path).encode()).hexdigest()[:12]
+    name = f"{os.path.splitext(os.path.basename(path))[0]}-{location}"
+    return source, os.path.join(CACHE_PATH, f"{name}.{digest}{suffix}")
+
+
+@contextmanager
+def write_cache(cache_file_path):
+    """
+    Open a compiled cache for writing, replacing older caches of the level.
+
+    The file is written under a temporary name and renamed into place at the
+    end, so a crash never leaves a half-written cache behind.
+
+    Args:
+        cache_file_path (str): Path from `read_level_source`.
+    """
+    os.makedirs(CACHE_PATH, exist_ok=True)
+
+    # Drop caches compiled from older versions of this level
+    name, _, suffix = os.path.basename(cache_file_path).rsplit(".", 2)
+    for old in os.listdir(CACHE_PATH):
+        if old.startswith(f"{name}.") and old.endswith(f".{suffix}"):
+            os.remove(os.path.join(CACHE_PATH, old))
+
+    temporary_path = cache_file_path + ".tmp"
+    with open(temporary_path, "wb") as cache_file:
+        yield cache_file
+    os.replace(temporary_path, cache_file_path)
+
+
+def player_rect(player):
+    """
+    Read the player's starting rect from a level file, checking it is usable.
+
+    Args:
+        player (dict): The level's "player" object.
+
+    Returns:
+        tuple: (x, y, width, height), all ints.
+
+    Raises:
+        ValueError: If a value is missing, not an integer, or the size is not
+            positive.
+    """
+    rect = []
+    for field in ("x", "y", "width", "height"):
+        value = player.get(field)
+        # bool is an int subclass, but never a coordinate
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"player {field} must be an integer, not {value!r}")
+        rect.append(value)
+    x, y, width, height = rect
+    if width <= 0 or height <= 0:
+        raise ValueError(f"player size must be positive, not {width}x{height}")
+    return x, y, width, height
+
+
+def compile_records(data):
+    """
+    Turn parsed level JSON into compact records of plain tuples.
+
+    Args:
+        data (dict): The parsed level file.
+
+    Returns:
+        dict: Records for the world, the player and each entity type.
+    """
+    return {
+        "world_width": data["world"]["width"],
+        "world_height": data["world"]["height"],
+        "player": player_rect(data["player"]),
+        "platforms": [tuple(rect) for rect in data.get("platforms", [])],
+        "enemies": [
+            (
+                tuple(enemy["rect"]),
+                EnemyMovement[enemy.get("movement", "horizontal").upper()].value,
+                enemy.get("speed", 2),
+                tuple(enemy["bounds"]) if enemy.get("bounds") else None,
+            )
+            for enemy in data.get("enemies", [])
+        ],
+        "lava": [tuple(rect) for rect in data.get("lava", [])],
+        "spikes": [tuple(spikes) for spikes in data.get("spikes", [])],
+        "coins": [tuple(position) for position in data.get("coins", [])],
+        "flag": (*data["flag"]["rect"], data["flag"]["image"]),
+    }
+
+
+def compile_level(data):
+    """
+    Turn parsed level JSON into compact records plus prebuilt indexes.
+
+    Args:
+        data (dict): The parsed level file.
+
+    Returns:
+        tuple: (records, platform_snapshot, static_snapshot) as taken by Level.
+    """
+    records = compile_records(data)
+
+    # Index plain rects; the snapshots only refer to entities by position
+    platforms = [Entity(*rect) for rect in records["platforms"]]
+    static = [
+        *platforms,
+        *[Entity(*rect) for rect in records["lava"]],
+        *[Entity(*spikes[:4]) for spikes in records["spikes"]],
+    ]
+    platform_index = SpatialHash.from_entities(platforms, PLATFORM_CELL_SIZE)
+    static_index = SpatialHash.from_entities(static, STATIC_CELL_SIZE)
+
+    return records, platform_index.snapshot(), static_index.snapshot()
@@ -0,0 +1,342 @@
+import json
+import pickle
+import struct
+from Coin import Coin, COIN_SIZE
+from Enemy import Enemy, EnemyDirection, EnemyMovement
+from Flag import Flag
+from Lava import Lava
+from Level import (
+    CACHE_ERRORS,
+    CACHE_VERSION,
+    PLATFORM_CELL_SIZE,
+    STATIC_CELL_SIZE,
+    TRIGGER_CELL_SIZE,
+    compile_records,
+    read_level_source,
+    write_cache,
+)
+from Platform import Platform
+from SpatialIndex import SpatialHash
+from Spikes import Spikes
+
+STREAM_CHUNK_WIDTH = 2048  # A multiple of StaticLayer's chunk width
+TRAILER = struct.Struct("<Q")  # Offset of the header, at the end of the file
+
+# Entity types, in the order their records are stored in a chunk
+CATEGORIES = ("platforms", "enemies", "lava", "spikes", "coins")
+
+
+class LevelStream:
+    """
+    A level that keeps only the chunks around the camera in memory.
+
+    The world is cut into columns of STREAM_CHUNK_WIDTH pixels. Each column's
+    entity records are stored separately in a compiled stream file, so
+    loading one is a seek and a small read. As the camera moves, columns
+    within `radius` chunks of the viewport are loaded and the rest evicted.
+    Collected coins and enemy positions are remembered across evictions.
+
+    Exposes the same attributes as Level, but the entity lists and indexes
+    only ever hold what is currently loaded.
+    """
+
+    def __init__(self, stream_file_path, radius=1):
+        """
+        Open a compiled stream file.
+
+        Args:
+            stream_file_path (str): Path to a file written by `compile_stream`.
+            radius (int): Chunks to keep loaded on each side of the viewport.
+        """
+        self.file = open(stream_file_path, "rb")
+        try:
+            self.file.seek(-TRAILER.size, 2)
+            (header_offset,) = TRAILER.unpack(self.file.read(TRAILER.size))
+            self.file.seek(header_offset)
+            version, header = pickle.load(self.file)
+            if version != CACHE_VERSION:
+                raise ValueError(f"{stream_file_path} is from another version")
+        except Exception:
+            self.file.close()
+            raise
+
+        self.radius = radius
+        self.chunk_width = header["chunk_width"]
+        self.chunk_offsets = header["chunk_offsets"]
+        self.counts = header["counts"]
+        self.world_width = header["world_width"]
+        self.world_height = header["world_height"]
+        # x, y, width and height the player starts with
+        self.player_start: tuple[int, int, int, int] = header["player"]
+        self.coin_count = self.counts["coins"]
+
+        # Live entities per type: entity id -> entity, and how many loaded
+        # chunks refer to each one (entities can span several chunks)
+        self.live = {category: {} for category in CATEGORIES}
+        self.references = {}
+        self.loaded_chunks = {}  # chunk -> (category, entity id) pairs in it
+
+        # State that outlives evictions
+        self.collected_coins = set()
+        # enemy id -> (x, y, direction, frame, timer, carry, previous position)
+        self.enemy_states = {}
+
+        self.platforms = []
+        self.enemies = []
+        self.lava_pools = []
+        self.spike_traps = []
+        self.coins = []
+
+        self.platform_index = SpatialHash(PLATFORM_CELL_SIZE)
+        self.static_index = SpatialHash(STATIC_CELL_SIZE)
+        self.triggers = SpatialHash(TRIGGER_CELL_SIZE)
+        self.sprites = SpatialHash(TRIGGER_CELL_SIZE)
+
+        # The flag is always loaded, and sorts after everything else
+        self.flag = Flag(*header["flag"])
+        self.triggers.insert(self.flag, self._trigger_key("flag", 0))
+        self.sprites.insert(self.flag, self._sprite_key("flag", 0))
+
+    @classmethod
+    def open(cls, path, radius=1):
+        """
+        Open a level file for streaming, compiling it first if needed.
+
+        Args:
+            path (str): Path to the level's JSON file.
+            radius (int): Chunks to keep loaded on each side of the viewport.
+
+        Returns:
+            LevelStream: The opened level.
+        """
+        source, stream_file_path = read_level_source(path, ".stream")
+        try:
+            return cls(stream_file_path, radius)
+        except (*CACHE_ERRORS, struct.error):
+            compile_stream(json.loads(source), stream_file_path)
+            return cls(stream_file_path, radius)
+
+    def close(self):
+        self.file.close()
+
+    # Index keys keep query results in the same order as a fully loaded Level
+
+    def _static_key(self, category, entity_id):
+        offset = {
+            "platforms": 0,
+            "lava": self.counts["platforms"],
+            "spikes": self.counts["platforms"] + self.counts["lava"],
+        }[category]
+        return offset + entity_id
+
+    def _trigger_key(self, category, entity_id):
+        offset = 0
+        for previous in ("lava", "spikes", "coins", "flag"):
+            if previous == category:
+                return offset + entity_id
+            offset += self.counts[previous]
+
+    def _sprite_key(self, category, entity_id):
+        offset = 0
+        for previous in ("coins", "flag"):
+            if previous == category:
+                return offset + entity_id
+            offset += self.counts[previous]
+
+    def _build(self, category, entity_id, record):
+        if category == "platforms":
+            return Platform(*record)
+        if category == "lava":
+            return Lava(*record)
+        if category == "spikes":
+            return Spikes(*record)
+        if category == "coins":
+            return Coin(*record)
+
+        (x, y, width, height), movement, speed, bounds = record
+        enemy = Enemy(x, y, width, height, EnemyMovement(movement), speed, bounds)
+        state = self.enemy_states.pop(entity_id, None)
+        if state is not None:
+            x, y, direction, frame, timer, carry, previous_position = state
+            enemy.rect.topleft = (x, y)
+            enemy.direction = EnemyDirection(direction)
+            enemy.current_frame_index = frame
+            enemy.frame_timer = timer
+            enemy.carry = carry
+            enemy.previous_position = previous_position
+        return enemy
+
+    def _activate(self, category, entity_id, entity):
+        if category in ("platforms", "lava", "spikes"):
+            self.static_index.insert(entity, self._static_key(category, entity_id))
+        if category == "platforms":
+            self.platform_index.insert(entity, entity_id)
+        # Enemies are left to EnemySystem, as in Level
+        if category in ("lava", "spikes", "coins"):
+            self.triggers.insert(entity, self._trigger_key(category, entity_id))
+        if category == "coins":
+            self.sprites.insert(entity, self._sprite_key(category, entity_id))
+
+    def _deactivate(self, category, entity_id, entity):
+        for index in (
+            self.platform_index,
+            self.static_index,
+            self.triggers,
+            self.sprites,
+        ):
+            if entity in index:
+                index.remove(entity)
+
+        # Remember anything the player changed, for when the chunk comes back
+        if category == "coins" and entity.collected:
+            self.collected_coins.add(entity_id)
+        elif category == "enemies":
+            self.enemy_states[entity_id] = (
+                entity.rect.x,
+                entity.rect.y,
+                entity.direction.value,
+                entity.current_frame_index,
+                entity.frame_timer,
+                entity.carry,
+                entity.previous_position,
+            )
+
+    def _load_chunk(self, chunk):
+        offset, length = self.chunk_offsets[chunk]
+        self.file.seek(offset)
+        records = pickle.loads(self.file.read(length))
+
+        contents = []
+        for category in CATEGORIES:
+            live = self.live[category]
+            for entity_id, record in records[category]:
+                key = (category, entity_id)
+                contents.append(key)
+                self.references[key] = self.references.get(key, 0) + 1
+                if entity_id in live:
+                    continue
+                if category == "coins" and entity_id in self.collected_coins:
+                    continue
+                entity = self._build(category, entity_id, record)
+                live[entity_id] = entity
+                self._activate(category, entity_id, entity)
+        self.loaded_chunks[chunk] = contents
+
+    def _evict_chunk(self, chunk):
+        for key in self.loaded_chunks.pop(chunk):
+            self.references[key] -= 1
+            if self.references[key]:
+                continue
+            del self.references[key]
+            category, entity_id = key
+            entity = self.live[category].pop(entity_id, None)
+            if entity is not None:
+                self._deactivate(category, entity_id, entity)
+
+    def _refresh_lists(self):
+        for category, entities in (
+            ("platforms", self.platforms),
+            ("enemies", self.enemies),
+            ("lava", self.lava_pools),
+            ("spikes", self.spike_traps),
+            ("coins", self.coins),
+        ):
+            live = self.live[category]
+            entities[:] = [live[entity_id] for entity_id in sorted(live)]
+
+    def update(self, camera, before_change=None):
+        """
+        Load the chunks around the camera and evict the ones far from it.
+
+        Args:
+            camera (Camera): The game camera.
+            before_change: Called with no arguments just before any entity is
+                loaded or evicted, e.g. to save state held outside the
+                entities before they are read.
+
+        Returns:
+            list: (left, right) world x ranges whose static geometry changed.
+        """
+        first = max(camera.rect.left // self.chunk_width - self.radius, 0)
+        last = min(
+            (camera.rect.right - 1) // self.chunk_width + self.radius,
+            len(self.chunk_offsets) - 1,
+        )
+        wanted = set(range(first, last + 1))
+        if wanted == self.loaded_chunks.keys():
+            return []
+        if before_change is not None:
+            before_change()
+
+        changed = []
+        for chunk in sorted(self.loaded_chunks.keys() - wanted):
+            self._evict_chunk(chunk)
+        for chunk in sorted(wanted - self.loaded_chunks.keys()):
+            self._load_chunk(chunk)
+            changed.append((chunk * self.chunk_width, (chunk + 1) * self.chunk_width))
+        self._refresh_lists()
+        return changed
+
+
+def _enemy_extent(record):
+    (x, y, width, height), movement, speed, bounds = record
+    left, right = x, x + width
+    if bounds and EnemyMovement(movement) == EnemyMovement.HORIZONTAL:
+        left, right = min(left, bounds[0]), max(right, bounds[1])
+    return left, right
+
+
+def compile_stream(data, stream_file_path, chunk_width=STREAM_CHUNK_WIDTH):
+    """
+    Write a level as a stream file: one pickled blob per chunk, then a header
+    with the offset of every chunk, then the header's own offset.
+
+    Entities are filed under every chunk their x extent touches; enemies
+    under every chunk their patrol can reach.
+
+    Args:
+        data (dict): The parsed level file.
+        stream_file_path (str): Where to write the stream.
+        chunk_width (int): Width of each chunk, in pixels.
+    """
+    records = compile_records(data)
+    chunk_count = max(1, -(-records["world_width"] // chunk_width))
+    chunks = [{category: [] for category in CATEGORIES} for _ in range(chunk_count)]
+
+    def file_under(category, entity_id, record, left, right):
+        first = max(left // chunk_width, 0)
+        last = min((max(right, left + 1) - 1) // chunk_width, chunk_count - 1)
+        for chunk in range(first, last + 1):
+            chunks[chunk][category].append((entity_id, record))
+
+    for category in ("platforms", "lava", "spikes"):
+        for entity_id, record in enumerate(records[category]):
+            x, width = record[0], record[2]
+            file_under(category, entity_id, record, x, x + width)
+    for entity_id, record in enumerate(records["enemies"]):
+        file_under("enemies", entity_id, record, *_enemy_extent(record))
+    for entity_id, (x, y) in enumerate(records["coins"]):
+        file_under("coins", entity_id, (x, y), x, x + COIN_SIZE)
+
+    with write_cache(stream_file_path) as stream_file:
+        chunk_offsets = []
+        for chunk in chunks:
+            blob = pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL)
+            chunk_offsets.append((stream_file.tell(), len(blob)))
+            stream_file.write(blob)
+
+        header = {
+            "chunk_width": chunk_width,
+            "chunk_offsets": chunk_offsets,
+            "counts": {
+                **{category: len(records[category]) for category in CATEGORIES},
+                "flag": 1,
+            },
+            "world_width": records["world_width"],
+            "world_height": records["world_height"],
+            "player": records["player"],
+            "flag": records["flag"],
+        }
+        header_offset = stream_file.tell()
+        pickle.dump((CACHE_VERSION, header), stream_file, pickle.HIGHEST_PROTOCOL)
+        stream_file.write(TRAILER.pack(header_offset))
@@ -0,0 +1,95 @@
+import queue
+import threading
+
+
+class AssetLoader:
+    """
+    Runs loading jobs one after another on a worker thread, so the main
+    thread can keep pumping events and drawing while files are read and
+    decoded.
+
+    A job's `work` does the slow part and must not touch the display.
+    Anything that does, like converting surfaces to the display format or
+    building entities, goes in its `ready` callback, which `poll` calls on
+    the main thread once the job is done. Callbacks run in the order the
+    jobs were added.
+    """
+
+    def __init__(self):
+        self.jobs = []  # (name, work, ready)
+        self.finished = queue.Queue()  # (name, ready, result, error) from the worker
+        self.done = set()  # Jobs whose ready callback has run
+        self.thread = None
+
+    def add(self, name, work=None, ready=None):
+        """
+        Queue a job. Add every job before calling `start`.
+
+        Args:
+            name (str): Name to check with `ready` and show while loading.
+            work: Called with no arguments on the worker thread; None for a
+                job that only has main-thread work.
+            ready: Called on the main thread with what `work` returned.
+        """
+        self.jobs.append((name, work, ready))
+
+    def start(self):
+        """Start working through the jobs in the background."""
+        self.thread = threading.Thread(
+            target=self._run, name="asset-loader", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self):
+        for name, work, ready in self.jobs:
+            try:
+                result = work() if work is not None else None
+            except Exception as error:  # Raised again on the main thread
+                self.finished.put((name, ready, None, error))
+                return
+            self.finished.put((name, ready, result, None))
+
+    def poll(self):
+        """
+        Run the ready callbacks of jobs the worker has finished. Call once a
+        frame from the main thread.
+
+        Raises:
+            Exception: Whatever a job's work raised.
+        """
+        while True:
+            try:
+                name, ready, result, error = self.finished.get_nowait()
+            except queue.Empty:
+                return
+            if error is not None:
+                raise error
+            if ready is not None:
+                ready(result)
+            self.done.add(name)
+
+    def wait(self):
+        """
+        Block until every job is done, then run the remaining callbacks.
+        If `start` was never called, the jobs run here instead.
+        """
+        if self.thread is None:
+            self._run()
+        else:
+            self.thread.join()
+        self.poll()
+
+    def ready(self, *names):
+        """
+        Returns:
+            bool: Whether every named job is done, callbacks included.
+        """
+        return all(name in self.done for name in names)
+
+    @property
+    def current(self):
+        """Name of the first job not yet done, or None once all are."""
+        for name, _, _ in self.jobs:
+            if name not in self.done:
+                return name
+        return None
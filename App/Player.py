@@ -1,12 +1,16 @@
 import pygame
 from BounceEffect import BounceLeft
 from Entity import Entity
+from Assets import assets
+from Input import KeyboardInput
+from SpatialIndex import nearby
+from Sweep import Path, first_impact
 from enum import Enum
 import os
 
 ASSETS_PATH = os.path.join(".", "App", "assets")
 
-STATIC_FRAME = os.path.join(ASSETS_PATH, "player", "static.PNG")
+STATIC_FRAME = os.path.join(ASSETS_PATH, "player", "static.png")
 JUMP_FRAMES = [
     os.path.join(ASSETS_PATH, "player", "jump", f"{i}.PNG") for i in range(1, 9)
 ]
@@ -17,6 +21,10 @@ HIT_FRAMES = [
     os.path.join(ASSETS_PATH, "player", "hit", f"{i}.PNG") for i in range(1, 8)
 ]
 
+# Speeds and gravity are in pixels per tick at this rate, and are scaled to
+# cover the same distance per second at any other
+REFERENCE_TICK_RATE = 60
+
 
 class PlayerState(Enum):
     STATIC = "static"
@@ -31,22 +39,41 @@ class PlayerDirection(Enum):
 
 
 class Player(Entity):
-    animations = {
+    # Image files for each state's frames, loaded into `animations`
+    frame_paths = {
         PlayerState.STATIC: [STATIC_FRAME],
         PlayerState.JUMP: JUMP_FRAMES,
         PlayerState.WALK: WALK_FRAMES,
         PlayerState.HIT: HIT_FRAMES,
     }
 
-    def __init__(self, x, y, width, height, world_width, world_height):
+    # Speeds `update` sets, in pixels per tick at REFERENCE_TICK_RATE
+    WALK_SPEED = 5
+    JUMP_SPEED = 15
+    KNOCKBACK_SPEED = 8
+
+    def __init__(
+        self, x, y, width, height, world_width, world_height, input_source=None
+    ):
         """
         Initialize the player object.
+
+        Args:
+            input_source: Anything with a `poll()` returning Controls, see
+                Input.py. Defaults to the keyboard.
         """
+        self.input_source = input_source or KeyboardInput()
         self.rect = pygame.Rect(x, y, width, height)
+        self.previous_position = self.rect.topleft  # Where the last tick started
+        # Moves made during the last tick, for contacts along the way
+        self.path = Path()
+        self.path.add(self.rect.copy(), self.rect)
 
         # Horizontal & vertical velocities
         self.velocity_x = 0
         self.velocity_y = 0
+        # Fraction of a pixel moved in x but not yet applied to the rect
+        self.carry_x = 0.0
 
         self.on_ground = False
         self.gravity = 0.8
@@ -59,7 +86,17 @@ class Player(Entity):
         # Preload and scale animations
         self.animations = {
             state: self.load_frames(paths, (80 if state == PlayerState.HIT else height))
-            for state, paths in Player.animations.items()
+            for state, paths in Player.frame_paths.items()
+        }
+        # Left-facing copies, mirrored once here instead of on every draw.
+        # The hit animation is drawn the same way in both directions.
+        self.mirrored_animations = {
+            state: (
+                self.animations[state]
+                if state == PlayerState.HIT
+                else self.load_frames(paths, height, flip_x=True)
+            )
+            for state, paths in Player.frame_paths.items()
         }
         self.current_state = PlayerState.STATIC
         self.current_frame_index = 0
@@ -71,39 +108,76 @@ class Player(Entity):
         # Example bounce/knockback effect class
         self.bounce_effect = BounceLeft(500, 200)
 
-    def load_frames(self, paths, new_height):
-        frames = [pygame.image.load(path) for path in paths]
-        scaled = []
-        for frame in frames:
-            og_width, og_height = frame.get_size()
-            new_width = int(og_width * (new_height / og_height))
-            scaled_frame = pygame.transform.scale(frame, (new_width, new_height))
-            scaled.append(scaled_frame)
-        return scaled
+    def load_frames(self, paths, new_height, flip_x=False):
+        return [assets.image_with_height(path, new_height, flip_x) for path in paths]
 
     def _set_state(self, state):
         if state != self.current_state:
             self.current_state = state
             self.current_frame_index = 0  # Reset frame
 
-    def update_animation(self):
-        self.frame_timer += 0.5
+    def update_animation(self, ticks=1.0):
+        """
+        Advance the animation. Called once per tick, from `update`.
+
+        Args:
+            ticks (float): How many REFERENCE_TICK_RATE ticks have passed.
+        """
+        self.frame_timer += ticks
         if self.frame_timer >= self.frame_delay:
             self.frame_timer = 0
             self.current_frame_index = (self.current_frame_index + 1) % len(
                 self.animations[self.current_state]
             )
 
-    def update(self, delta_time, platforms, screen, camera):
+    def _stop_at_first_platform(self, platforms, start):
+        """
+        Cut the move from `start` to where the player is now short, one pixel
+        into the first platform in its way, so a fast move can't carry the
+        player through a platform and out the other side.
+
+        The push-out that follows then leaves the player against that
+        platform, just as it would after a move too short to pass through,
+        and platforms beyond it are never reached.
+
+        Args:
+            platforms: A SpatialHash or any iterable of platforms.
+            start (pygame.Rect): Where the move started. Moves run along one
+                axis at a time.
+        """
+        dx = self.rect.x - start.x
+        dy = self.rect.y - start.y
+        distance = abs(dx) + abs(dy)
+        # A move no longer than the player still overlaps, where it ends,
+        # every platform it entered, so the push-out alone is enough
+        if not platforms or distance <= (self.rect.width if dx else self.rect.height):
+            return
+
+        time = first_impact(nearby(platforms, self.rect, start), start, dx, dy)
+        if time is None:
+            return
+        stop = round(time * distance) + 1
+        if stop < distance:
+            self.rect.topleft = (
+                start.x + dx * stop // distance,
+                start.y + dy * stop // distance,
+            )
+
+    def update(self, delta_time, platforms):
         """
         Update player's movement, collisions, and animation in a single method.
         This handles normal input as well as bounce/knockback arcs.
         """
+        # Poll every tick, even while knocked back, so scripted input stays
+        # in step with the simulation
+        controls = self.input_source.poll()
+        ticks = delta_time * REFERENCE_TICK_RATE
+
         # --------------------
         # 1) Check Bounce Effect
         # --------------------
         if self.bounce_effect.is_active():
-            self.bounce_effect.update(delta_time, screen, camera)
+            self.bounce_effect.update(delta_time)
             self._set_state(PlayerState.HIT)
             if not self.bounce_effect.is_active():
                 self._set_state(PlayerState.STATIC)
@@ -111,10 +185,10 @@ class Player(Entity):
             # Example logic: use velocity_x, velocity_y from bounce
             # Let's say bounce gives a "parabolic" knockback to the left
             # You can tweak these values or read them from bounce_effect's logic
-            self.velocity_x = -8  # knockback to the left
+            self.velocity_x = -self.KNOCKBACK_SPEED  # knockback to the left
             # If you want an upward initial kick:
             if self.on_ground:
-                self.velocity_y = -15
+                self.velocity_y = -self.JUMP_SPEED
 
             # Force direction to left (you can do right if you want)
             self.direction = PlayerDirection.LEFT
@@ -123,25 +197,30 @@ class Player(Entity):
             # --------------------
             # 2) Normal Input
             # --------------------
-            keys = pygame.key.get_pressed()
-
             # Reset horizontal velocity each frame (unless you want momentum)
             self.velocity_x = 0
 
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                self.velocity_x = -5
+            if controls.left:
+                self.velocity_x = -self.WALK_SPEED
                 self.direction = PlayerDirection.LEFT
-            elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                self.velocity_x = 5
+            elif controls.right:
+                self.velocity_x = self.WALK_SPEED
                 self.direction = PlayerDirection.RIGHT
 
-            if keys[pygame.K_SPACE] and self.on_ground:
-                self.velocity_y = -15
+            if controls.jump and self.on_ground:
+                self.velocity_y = -self.JUMP_SPEED
 
         # ----------------------------
         # 3) Move and Collision in X
         # ----------------------------
-        self.rect.x += self.velocity_x
+        self.path = Path()
+        swept = self.rect.copy()
+        # Sub-pixel moves add up over ticks instead of rounding away
+        moved = self.velocity_x * ticks + self.carry_x
+        self.rect.x += moved  # type: ignore
+        self.carry_x = swept.x + moved - self.rect.x
+        self._stop_at_first_platform(platforms, swept)
+        self.path.add(swept, self.rect)
 
         # World boundary check (horizontal)
         if self.rect.left < 0:
@@ -151,7 +230,7 @@ class Player(Entity):
 
         # Check horizontal collisions
         if platforms:
-            for platform in platforms:
+            for platform in nearby(platforms, self.rect, swept):
                 if self.rect.colliderect(platform.rect):
                     # Moving right, push player out on the left side
                     if self.velocity_x > 0:
@@ -163,15 +242,25 @@ class Player(Entity):
         # --------------------------------
         # 4) Move and Collision in Y
         # --------------------------------
-        self.velocity_y += self.gravity
-        self.rect.y += self.velocity_y  # type: ignore
+        # Follows the arc the player traces at REFERENCE_TICK_RATE, so jumps
+        # reach the same height at any rate; the correction is 0 at that rate
+        self.velocity_y += self.gravity * ticks
+        swept = self.rect.copy()
+        fall = self.velocity_y * ticks + self.gravity * ticks * (1 - ticks) / 2
+        self.rect.y += fall  # type: ignore
+        # Standing players sink at least a pixel, so short ticks still find
+        # the ground under them
+        if self.on_ground and self.velocity_y > 0 and self.rect.y == swept.y:
+            self.rect.y += 1
+        self._stop_at_first_platform(platforms, swept)
+        self.path.add(swept, self.rect)
 
         # Reset on_ground until collisions prove otherwise
         self.on_ground = False
 
         # Check vertical collisions
         if platforms:
-            for platform in platforms:
+            for platform in nearby(platforms, self.rect, swept):
                 if self.rect.colliderect(platform.rect):
                     # Falling down onto the platform
                     if self.velocity_y > 0:
@@ -189,6 +278,10 @@ class Player(Entity):
             self.velocity_y = 0
             self.on_ground = True
 
+        # Pushes out of platforms and off the world's edges put the player
+        # somewhere without travelling there; only where it ends up counts
+        self.path.add(self.rect.copy(), self.rect)
+
         # --------------------
         # 5) State & Animation
         # --------------------
@@ -201,19 +294,15 @@ class Player(Entity):
             else:
                 self._set_state(PlayerState.STATIC)
 
-        self.update_animation()
+        self.update_animation(ticks)
 
-    def draw(self, screen, camera):
-        current_frame = self.animations[self.current_state][self.current_frame_index]
-
-        if (
-            self.direction == PlayerDirection.LEFT
-            and self.current_state == PlayerState.HIT
-        ):
-            current_frame = pygame.transform.flip(current_frame, False, False)  # type: ignore
-
-        # Flip if facing LEFT
-        elif self.direction == PlayerDirection.LEFT:
-            current_frame = pygame.transform.flip(current_frame, True, False)  # type: ignore
+    def current_image(self) -> pygame.Surface:
+        # Use the mirrored frames if facing LEFT
+        if self.direction == PlayerDirection.LEFT:
+            animations = self.mirrored_animations
+        else:
+            animations = self.animations
+        return animations[self.current_state][self.current_frame_index]
 
-        screen.blit(current_frame, camera.apply(self))
+    def draw(self, screen, camera):
+        screen.blit(self.current_image(), camera.apply(self))
@@ -0,0 +1,163 @@
+import csv
+import json
+import time
+
+# What Game.frame spends its time on, in the order it happens. Simulation
+# phases run once per tick, so a frame that catches up on several ticks adds
+# them all to its row.
+PHASES = (
+    "events",  # Window events
+    "player",  # Input, movement, platform collisions, animation
+    "enemies",  # Enemy movement
+    "contacts",  # Enemy, lava, spike, coin and flag checks and their sounds
+    "audio",  # Sound cooldowns, resuming the music after the lava sound
+    "level",  # Camera and level streaming
+    "clear",  # Clearing the screen, placing the camera, knockback trail
+    "text",  # The how-to-play text
+    "draw_player",
+    "static",  # Baked platform, lava and spike chunks
+    "sprites",  # Culling and drawing enemies, coins and the flag
+    "hud",  # Coin counter and overlays
+    "flip",
+)
+
+
+class FrameProfiler:
+    """
+    Times each phase of every frame into a fixed-size ring buffer.
+
+    Game.frame calls `begin_frame`, then `lap` as each phase finishes and
+    `end_frame` at the end; a lap charges the time since the previous one to
+    its phase. Rows are preallocated and overwritten in place, so recording
+    allocates nothing. While disabled every call returns straight away.
+    """
+
+    def __init__(self, capacity=600, phases=PHASES):
+        """
+        Initialize the profiler, disabled.
+
+        Args:
+            capacity (int): Frames kept; older ones are overwritten.
+            phases (tuple): Phase names, in the order they are lapped.
+        """
+        self.capacity = capacity
+        self.phases = phases
+        self.columns = {phase: column for column, phase in enumerate(phases, 1)}
+        # Column 0 is the whole frame, then one per phase, all in seconds
+        self.rows = [[0.0] * (len(phases) + 1) for _ in range(capacity)]
+        self.frames = 0  # Frames recorded, including overwritten ones
+        self.enabled = False
+        self.row = self.rows[0]
+        self.frame_start = 0.0
+        self.last = 0.0
+
+    def toggle(self):
+        """Start or stop recording. Frames already recorded are kept."""
+        self.enabled = not self.enabled
+        if self.enabled:
+            # Mid-frame, so this frame's row only covers what is left of it
+            self.begin_frame()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        row = self.rows[self.frames % self.capacity]
+        for column in range(len(row)):
+            row[column] = 0.0
+        self.row = row
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Charge the time since the last lap to `phase`.
+
+        Args:
+            phase (str): One of the profiler's phases.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.row[self.columns[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.row[0] = time.perf_counter() - self.frame_start
+        self.frames += 1
+
+    def recent(self, count=None):
+        """
+        Args:
+            count (int): How many of the latest frames to return; all kept
+                frames if None.
+
+        Returns:
+            list: Rows of [frame, *phases] in milliseconds, oldest first.
+        """
+        kept = min(self.frames, self.capacity)
+        count = kept if count is None else min(count, kept)
+        return [
+            [seconds * 1000 for seconds in self.rows[frame % self.capacity]]
+            for frame in range(self.frames - count, self.frames)
+        ]
+
+    def summary(self, count=120):
+        """
+        Summarize the latest frames.
+
+        Args:
+            count (int): How many of the latest frames to look at.
+
+        Returns:
+            dict: Frame count, mean and worst frame time, the phase that took
+                longest in the worst frame, and every phase's mean time,
+                slowest first. Times are in milliseconds. None if nothing has
+                been recorded.
+        """
+        rows = self.recent(count)
+        if not rows:
+            return None
+        worst = max(rows, key=lambda row: row[0])
+        worst_phase = max(self.phases, key=lambda phase: worst[self.columns[phase]])
+        means = {
+            phase: sum(row[column] for row in rows) / len(rows)
+            for phase, column in self.columns.items()
+        }
+        return {
+            "frames": len(rows),
+            "mean": sum(row[0] for row in rows) / len(rows),
+            "max": worst[0],
+            "worst_phase": worst_phase,
+            "worst_phase_time": worst[self.columns[worst_phase]],
+            "phases": sorted(means.items(), key=lambda item: item[1], reverse=True),
+        }
+
+    def export(self, path):
+        """
+        Write every kept frame to `path`, one row per frame, in milliseconds.
+
+        Args:
+            path (str): A .csv or .json file.
+        """
+        header = ["frame_ms", *self.phases]
+        first = self.frames - min(self.frames, self.capacity)
+        rows = [[first + number, *row] for number, row in enumerate(self.recent())]
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(["number", *header])
+                writer.writerows(rows)
+        elif path.endswith(".json"):
+            with open(path, "w") as json_file:
+                json.dump(
+                    {
+                        "units": "ms",
+                        "frames": [dict(zip(["number", *header], row)) for row in rows],
+                        "summary": self.summary(len(rows)),
+                    },
+                    json_file,
+                    indent=2,
+                )
+        else:
+            raise ValueError(f"Can't export a profile to {path}: use .csv or .json")
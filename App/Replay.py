@@ -0,0 +1,189 @@
+import hashlib
+import struct
+from collections import namedtuple
+from Input import ScriptedInput, decode, encode
+
+RUN_MAGIC = b"SRUN"
+RUN_VERSION = 3  # Bumped whenever the same controls would play out differently
+
+# magic, version, tick rate, SHA-1 of the level file, ticks recorded
+HEADER = struct.Struct("<4sBH20sI")
+# Final player x, y, coins collected and whether the level was completed,
+# checked after a replay to prove it ended up exactly where the recording did
+OUTCOME = struct.Struct("<iiI?")
+# Held controls as bits, and how many ticks in a row they were held
+SPAN = struct.Struct("<BH")
+MAX_SPAN = 0xFFFF
+
+Outcome = namedtuple("Outcome", ["x", "y", "coins", "level_complete"])
+Run = namedtuple("Run", ["tick_rate", "level_digest", "controls", "outcome"])
+
+
+def level_digest(level_path):
+    """
+    Args:
+        level_path (str): Path to a level's JSON file.
+
+    Returns:
+        bytes: SHA-1 of the file, so a run is never replayed on another level.
+    """
+    with open(level_path, "rb") as level_file:
+        return hashlib.sha1(level_file.read()).digest()
+
+
+def outcome(game):
+    """
+    Args:
+        game (Game): A game that has finished simulating.
+
+    Returns:
+        Outcome: Where the run ended up.
+    """
+    return Outcome(
+        game.player.rect.x,
+        game.player.rect.y,
+        game.total_coins_collected,
+        game.level_complete,
+    )
+
+
+class InputRecorder:
+    """
+    Passes another input source through unchanged, keeping every tick's
+    controls so the run can be saved with `save_run`.
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source: The input source to record, e.g. KeyboardInput.
+        """
+        self.source = source
+        self.controls = []
+
+    def poll(self):
+        """
+        Returns:
+            Controls: Whatever the recorded source returned.
+        """
+        controls = self.source.poll()
+        self.controls.append(controls)
+        return controls
+
+    def restart(self):
+        """Forget what was recorded, for when the level starts over."""
+        self.controls = []
+
+
+def save_run(path, run):
+    """
+    Write a run file. Controls rarely change from one tick to the next, so
+    they are stored as spans of identical ticks: a few bytes per key press
+    rather than per tick.
+
+    Args:
+        path (str): Where to write the run.
+        run (Run): The recorded run.
+    """
+    spans = []
+    for controls in run.controls:
+        bits = encode(controls)
+        if spans and spans[-1][0] == bits and spans[-1][1] < MAX_SPAN:
+            spans[-1][1] += 1
+        else:
+            spans.append([bits, 1])
+
+    with open(path, "wb") as run_file:
+        run_file.write(
+            HEADER.pack(
+                RUN_MAGIC,
+                RUN_VERSION,
+                run.tick_rate,
+                run.level_digest,
+                len(run.controls),
+            )
+        )
+        run_file.write(OUTCOME.pack(*run.outcome))
+        for bits, length in spans:
+            run_file.write(SPAN.pack(bits, length))
+
+
+def load_run(path):
+    """
+    Read a run file written by `save_run`.
+
+    Args:
+        path (str): Path to the run file.
+
+    Returns:
+        Run: The recorded run.
+    """
+    with open(path, "rb") as run_file:
+        data = run_file.read()
+
+    magic, version, tick_rate, digest, ticks = HEADER.unpack_from(data)
+    if magic != RUN_MAGIC or version != RUN_VERSION:
+        raise ValueError(f"{path} is not a version {RUN_VERSION} run file")
+    recorded = Outcome(*OUTCOME.unpack_from(data, HEADER.size))
+
+    controls = []
+    for bits, length in SPAN.iter_unpack(data[HEADER.size + OUTCOME.size :]):
+        controls.extend([decode(bits)] * length)
+    if len(controls) != ticks:
+        raise ValueError(f"{path} is truncated")
+
+    return Run(tick_rate, digest, controls, recorded)
+
+
+def record(game, level_path):
+    """
+    Package what an InputRecorder captured during a game as a Run.
+
+    Args:
+        game (Game): The finished game; its input source must be an
+            InputRecorder.
+        level_path (str): The level that was played.
+
+    Returns:
+        Run: The recorded run.
+    """
+    return Run(
+        game.tick_rate,
+        level_digest(level_path),
+        game.input_source.controls,
+        outcome(game),
+    )
+
+
+def replay(run, level_path, streaming=False):
+    """
+    Play a run back headless and as fast as possible, through the same
+    Player.update path it was recorded from.
+
+    Args:
+        run (Run): The run to replay, see `load_run`.
+        level_path (str): The level it was recorded on.
+        streaming (bool): Stream the level in chunks, see LevelStream.py.
+
+    Returns:
+        Game: The game after the last recorded tick.
+    """
+    # Imported here so run files can be read without loading the game
+    from Game import Game
+
+    if level_digest(level_path) != run.level_digest:
+        raise ValueError(f"The run was not recorded on {level_path}")
+
+    game = Game(
+        level_path,
+        streaming,
+        tick_rate=run.tick_rate,
+        headless=True,
+        input_source=ScriptedInput(run.controls),
+    )
+    game.simulate(len(run.controls))
+    if outcome(game) != run.outcome:
+        raise ValueError(
+            f"Replay diverged: ended at {outcome(game)}, recorded {run.outcome}"
+        )
+    return game
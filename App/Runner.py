@@ -0,0 +1,218 @@
+"""
+Run many headless episodes across a pool of worker processes.
+
+An episode is a recorded run file or a scripted policy played against one
+level. Each worker loads the level once and plays every episode it is given
+on a fresh copy, sending back one small EpisodeResult per episode; the
+runner aggregates them as they arrive.
+
+Run from the repository root:
+
+    python App/Runner.py runs/*.run
+    python App/Runner.py --random 1000 --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from collections import namedtuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from Game import Game
+from Input import Controls, ScriptedInput
+from Level import Level, DEFAULT_LEVEL
+from Replay import level_digest, load_run, outcome
+
+MAX_TICKS = 36_000  # Ten minutes of play at 60 ticks per second
+
+# `source` is a run file path or a picklable callable taking the tick number
+# and returning Controls
+Episode = namedtuple("Episode", ["name", "source", "max_ticks"], defaults=(MAX_TICKS,))
+
+# `matched` says whether a replay ended where it was recorded; None for
+# policies, which have nothing to match
+EpisodeResult = namedtuple(
+    "EpisodeResult",
+    ["name", "ticks", "completed", "coins", "x", "y", "matched", "seconds"],
+)
+
+
+class RandomPolicy:
+    """
+    Controls held for random stretches, mostly heading right. Seeded, so an
+    episode plays the same way in whichever worker runs it.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.rng = None
+        self.controls = None
+        self.until = 0
+
+    def __call__(self, tick):
+        if self.rng is None:
+            self.rng = random.Random(self.seed)
+        if tick >= self.until:
+            rng = self.rng
+            self.controls = Controls(
+                rng.random() < 0.2, rng.random() < 0.8, rng.random() < 0.3
+            )
+            self.until = tick + rng.randrange(1, 40)
+        return self.controls
+
+
+# Per-process state, set up once by _start_worker
+_game = None
+_compiled = None
+_level_digest = None
+
+
+def _start_worker(level_path, tick_rate):
+    global _game, _compiled, _level_digest
+    _game = Game(level_path, headless=True, tick_rate=tick_rate)
+    _compiled = Level.load_compiled(level_path)
+    _level_digest = level_digest(level_path)
+
+
+def _play(episode):
+    """Play one episode on a fresh copy of the worker's level."""
+    game, compiled = _game, _compiled
+    assert game is not None and compiled is not None, "_start_worker ran first"
+    start = time.perf_counter()
+    run = None
+    if isinstance(episode.source, str):
+        run = load_run(episode.source)
+        if run.tick_rate != game.tick_rate:
+            raise ValueError(
+                f"{episode.source} was recorded at {run.tick_rate} ticks per "
+                f"second, not {game.tick_rate}"
+            )
+        input_source = ScriptedInput(run.controls)
+        max_ticks = len(run.controls)
+    else:
+        input_source = ScriptedInput(episode.source)
+        max_ticks = episode.max_ticks
+
+    game.input_source = input_source
+    game.set_level(Level(*compiled))
+    ticks = game.simulate(max_ticks)
+
+    ended = outcome(game)
+    matched = None
+    if run is not None:
+        matched = run.level_digest == _level_digest and ended == run.outcome
+    return EpisodeResult(
+        episode.name,
+        ticks,
+        ended.level_complete,
+        ended.coins,
+        ended.x,
+        ended.y,
+        matched,
+        time.perf_counter() - start,
+    )
+
+
+def run_episodes(episodes, level_path=DEFAULT_LEVEL, workers=None, tick_rate=60):
+    """
+    Play episodes across a process pool, yielding results as they finish.
+
+    Args:
+        episodes (iterable): Episode tuples; anything picklable as a source.
+        level_path (str): The level every episode is played on.
+        workers (int): Processes to use; defaults to one per CPU.
+        tick_rate (int): Simulation ticks per second, as for Game.
+
+    Yields:
+        EpisodeResult: One per episode, in the order they complete.
+    """
+    # Compile the level up front so workers don't all race to do it
+    Level.load_compiled(level_path)
+
+    workers = workers or os.cpu_count() or 1
+    with multiprocessing.Pool(
+        workers, initializer=_start_worker, initargs=(level_path, tick_rate)
+    ) as pool:
+        # Small batches keep workers busy without holding results back long
+        yield from pool.imap_unordered(_play, episodes, chunksize=4)
+
+
+def summarize(results, tick_rate=60):
+    """
+    Aggregate episode results.
+
+    Args:
+        results (list): EpisodeResult tuples.
+        tick_rate (int): Ticks per second the episodes ran at.
+
+    Returns:
+        dict: Episode counts, completion and coin rates, completion times in
+            seconds, and the names of replays that didn't match.
+    """
+    completed = [result for result in results if result.completed]
+    completion_times = [result.ticks / tick_rate for result in completed]
+    return {
+        "episodes": len(results),
+        "completed": len(completed),
+        "completion_rate": len(completed) / len(results) if results else 0.0,
+        "mean_coins": statistics.fmean(r.coins for r in results) if results else 0.0,
+        "median_completion_time": (
+            statistics.median(completion_times) if completion_times else None
+        ),
+        "best_completion_time": min(completion_times, default=None),
+        "ticks": sum(result.ticks for result in results),
+        "mismatched": [result.name for result in results if result.matched is False],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run many headless episodes across a pool of worker processes."
+    )
+    parser.add_argument("runs", nargs="*", help="run files to replay")
+    parser.add_argument("--random", type=int, default=0, help="random episodes to add")
+    parser.add_argument("--level", default=DEFAULT_LEVEL, help="level file to play")
+    parser.add_argument("--workers", type=int, help="processes (default: one per CPU)")
+    parser.add_argument(
+        "--ticks", type=int, default=MAX_TICKS, help="tick limit for random episodes"
+    )
+    args = parser.parse_args()
+
+    episodes = [Episode(path, path) for path in args.runs]
+    episodes += [
+        Episode(f"random-{seed}", RandomPolicy(seed), args.ticks)
+        for seed in range(args.random)
+    ]
+
+    start = time.perf_counter()
+    results = list(run_episodes(episodes, args.level, args.workers))
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print(
+        f"{summary['episodes']} episodes, {summary['completed']} completed "
+        f"({summary['completion_rate']:.0%}), {summary['mean_coins']:.2f} coins "
+        f"on average"
+    )
+    if summary["completed"]:
+        print(
+            f"completion time: median {summary['median_completion_time']:.1f}s, "
+            f"best {summary['best_completion_time']:.1f}s"
+        )
+    for name in summary["mismatched"]:
+        print(f"MISMATCH {name}")
+    print(
+        f"{summary['ticks']} ticks in {elapsed:.2f}s "
+        f"({summary['ticks'] / elapsed:,.0f} ticks/s)"
+    )
+    if summary["mismatched"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import pygame
+
+FADE_TIME = 52 / 60  # The old end sequence: alpha 0 to 255 in steps of 5 at 60 FPS
+RESULTS_TIME = 10.0  # Seconds the results stay up before the menu appears
+
+_overlays = {}  # (size, color) -> filled Surface, shared by every transition
+
+
+def overlay(size, color):
+    """
+    A screen-sized surface filled with one color, made once and reused by
+    every transition that needs it. Set its alpha before each blit.
+
+    Args:
+        size (tuple): (width, height) of the screen.
+        color (tuple): RGB fill color.
+
+    Returns:
+        pygame.Surface: The shared overlay.
+    """
+    key = (tuple(size), tuple(color))
+    surface = _overlays.get(key)
+    if surface is None:
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        _overlays[key] = surface
+    return surface
+
+
+class Scene:
+    """
+    One screen of the game: playing, a transition, the results or a menu.
+
+    Game.frame hands each event it doesn't handle itself to the current
+    scene, then calls `update` and `draw` once per frame. Scenes never loop
+    or wait on their own, so events keep being pumped and the window stays
+    responsive whatever is on screen. A scene moves on with
+    game.switch_scene.
+    """
+
+    def __init__(self, game):
+        """
+        Args:
+            game (Game): The game the scene belongs to.
+        """
+        self.game = game
+
+    def enter(self):
+        """Called when the scene becomes the current one."""
+
+    def handle_event(self, event):
+        """
+        React to a pygame event.
+
+        Args:
+            event (pygame.event.Event): The event.
+        """
+
+    def update(self, frame_time):
+        """
+        Advance the scene.
+
+        Args:
+            frame_time (float): Real seconds since the last frame.
+        """
+
+    def draw(self):
+        """
+        Draw the scene onto the game's screen.
+
+        Returns:
+            list: Screen areas that changed, or None if the whole screen may
+                have.
+        """
+        return None
+
+
+class LoadingScene(Scene):
+    """
+    A progress bar while the game's loader works, then the next scene as
+    soon as the jobs it needs are done.
+    """
+
+    def __init__(self, game, required, then):
+        """
+        Args:
+            game (Game): The game the scene belongs to.
+            required (tuple): Names of the loader jobs `then` needs.
+            then (Scene): Where to go once they are done.
+        """
+        super().__init__(game)
+        self.required = required
+        self.then = then
+        self.font = None
+
+    def enter(self):
+        # pygame's built-in font, so nothing waits on the system font search
+        self.font = pygame.font.Font(None, 32)
+
+    def update(self, frame_time):
+        if self.game.loader.ready(*self.required):
+            self.game.switch_scene(self.then)
+
+    def draw(self):
+        loader = self.game.loader
+        screen = self.game.screen
+        font = self.font
+        assert font is not None, "enter() ran first"
+        screen.fill((0, 0, 0))
+
+        done = sum(loader.ready(name) for name in self.required)
+        bar = pygame.Rect(0, 0, 400, 24)
+        bar.center = (screen.get_width() // 2, screen.get_height() // 2)
+        filled = bar.inflate(-8, -8)
+        filled.width = round(filled.width * done / len(self.required))
+        pygame.draw.rect(screen, (255, 255, 255), bar, 2)
+        pygame.draw.rect(screen, (255, 255, 255), filled)
+
+        text = font.render(f"Loading {loader.current or ''}", True, (255, 255, 255))
+        screen.blit(text, text.get_rect(midbottom=(bar.centerx, bar.top - 16)))
+        return None
+
+
+class PlayScene(Scene):
+    """The level itself, simulated in fixed ticks and drawn every frame."""
+
+    def update(self, frame_time):
+        game = self.game
+        if game.level_complete:
+            # The frame the flag was reached on is on screen; fade from it
+            results = ResultsScene(game)
+            game.switch_scene(FadeScene(game, game.screen.copy(), results))
+            return
+
+        game.accumulator += frame_time
+
+        # Run as many fixed ticks as real time has covered, however long
+        # the frame took to draw
+        while game.accumulator >= game.tick_time and not game.level_complete:
+            game.step()
+            game.accumulator -= game.tick_time
+
+    def draw(self):
+        game = self.game
+        game.render(game.accumulator / game.tick_time)
+        return game.updated_areas
+
+
+class FadeScene(Scene):
+    """
+    Fades a still of the screen to a color over a fixed time, then moves on.
+    """
+
+    def __init__(self, game, still, then, color=(0, 0, 0), duration=FADE_TIME):
+        """
+        Args:
+            game (Game): The game the scene belongs to.
+            still (pygame.Surface): Copy of the screen to fade out.
+            then (Scene): Where to go once the fade is done.
+            color (tuple): RGB color to fade to.
+            duration (float): Length of the fade, in seconds.
+        """
+        super().__init__(game)
+        self.still = still
+        self.then = then
+        self.duration = duration
+        self.elapsed = 0.0
+        self.overlay = overlay(still.get_size(), color)
+
+    def update(self, frame_time):
+        self.elapsed += frame_time
+        if self.elapsed >= self.duration:
+            self.game.switch_scene(self.then)
+
+    def draw(self):
+        screen = self.game.screen
+        screen.blit(self.still, (0, 0))
+        self.overlay.set_alpha(round(255 * min(self.elapsed / self.duration, 1.0)))
+        screen.blit(self.overlay, (0, 0))
+        return None
+
+
+class ResultsScene(Scene):
+    """
+    "FIN!" and the coins collected, until a key is pressed or RESULTS_TIME
+    has passed, then the menu.
+    """
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.elapsed = 0.0
+        self.surface = None
+
+    def enter(self):
+        # Everything on this screen is fixed, so it is drawn once
+        game = self.game
+        screen = game.screen
+        self.surface = pygame.Surface(screen.get_size())
+        self.surface.fill((0, 0, 0))
+
+        fin_text = game.text.render(game.title_font, "FIN!", (255, 255, 255))
+        fin_rect = fin_text.get_rect(center=(screen.get_width() // 2, 200))
+        self.surface.blit(fin_text, fin_rect)
+
+        coin_summary_text = game.text.render(
+            game.title_font,
+            f"Coins: {game.total_coins_collected}/{game.coin_count}",
+            (255, 255, 255),
+        )
+        coin_summary_rect = coin_summary_text.get_rect(
+            center=(screen.get_width() // 2, 300)
+        )
+        self.surface.blit(coin_summary_text, coin_summary_rect)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.game.switch_scene(MenuScene(self.game))
+
+    def update(self, frame_time):
+        self.elapsed += frame_time
+        if self.elapsed >= RESULTS_TIME:
+            self.game.switch_scene(MenuScene(self.game))
+
+    def draw(self):
+        self.game.screen.blit(self.surface, (0, 0))
+        return None
+
+
+class MenuScene(Scene):
+    """Play the level again or quit, picked with the arrow keys and Enter."""
+
+    OPTIONS = ("Play again", "Quit")
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.selected = 0
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key in (pygame.K_UP, pygame.K_w):
+            self.selected = (self.selected - 1) % len(self.OPTIONS)
+        elif event.key in (pygame.K_DOWN, pygame.K_s):
+            self.selected = (self.selected + 1) % len(self.OPTIONS)
+        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+            if self.OPTIONS[self.selected] == "Play again":
+                self.game.restart()
+            else:
+                self.game.stop()
+        elif event.key == pygame.K_ESCAPE:
+            self.game.stop()
+
+    def draw(self):
+        game = self.game
+        screen = game.screen
+        screen.fill((0, 0, 0))
+
+        # Lines come from the text cache, so redrawing them costs two blits
+        for number, option in enumerate(self.OPTIONS):
+            color = (255, 255, 255) if number == self.selected else (120, 120, 120)
+            text = game.text.render(game.title_font, option, color)
+            rect = text.get_rect(center=(screen.get_width() // 2, 250 + number * 80))
+            screen.blit(text, rect)
+        return None
@@ -0,0 +1,230 @@
+class SpatialHash:
+    """
+    Uniform grid that buckets entities by the cells their rect overlaps.
+
+    Entities are kept in insertion order, so every query returns its results in
+    the same order a linear scan over the original list would visit them.
+    """
+
+    def __init__(self, cell_size=128):
+        """
+        Initialize the grid.
+
+        Args:
+            cell_size (int): Width and height of a grid cell, in pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of entity keys
+        self.entities = {}  # key -> entity
+        self.keys = {}  # entity -> key
+        self.spans = {}  # key -> cell span the entity is filed under
+        self.next_key = 0
+
+    @classmethod
+    def from_entities(cls, entities, cell_size=128):
+        """
+        Build a grid holding `entities`, preserving their order.
+
+        Args:
+            entities (list): Entities with a `rect` attribute.
+            cell_size (int): Width and height of a grid cell, in pixels.
+
+        Returns:
+            SpatialHash: The populated grid.
+        """
+        grid = cls(cell_size)
+        for entity in entities:
+            grid.insert(entity)
+        return grid
+
+    @classmethod
+    def from_snapshot(cls, entities, snapshot):
+        """
+        Rebuild a grid from `snapshot()` output without re-bucketing.
+
+        Args:
+            entities (list): The same entities, in the same order, that were
+                in the grid when the snapshot was taken.
+            snapshot (tuple): Output of `snapshot()`.
+
+        Returns:
+            SpatialHash: The restored grid.
+        """
+        cell_size, cells, spans = snapshot
+        grid = cls(cell_size)
+        grid.cells = cells
+        grid.spans = spans
+        grid.entities = dict(enumerate(entities))
+        grid.keys = {entity: key for key, entity in grid.entities.items()}
+        grid.next_key = len(entities)
+        return grid
+
+    def snapshot(self):
+        """
+        Capture the grid's buckets as plain data that can be pickled.
+
+        Only valid for grids whose entities were inserted in order and never
+        removed, which is how level geometry is built.
+
+        Returns:
+            tuple: (cell_size, cells, spans).
+        """
+        return self.cell_size, self.cells, self.spans
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __iter__(self):
+        return iter(self.entities.values())
+
+    def __contains__(self, entity):
+        return entity in self.keys
+
+    def _cell_span(self, rect):
+        size = self.cell_size
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size,
+        )
+
+    def insert(self, entity, key=None):
+        """
+        Add an entity to the grid.
+
+        Args:
+            entity: Object with a `rect` attribute.
+            key (int): Where the entity sorts among query results. Defaults to
+                after every entity inserted so far.
+        """
+        if key is None:
+            key = self.next_key
+        self.next_key = max(self.next_key, key + 1)
+        self.entities[key] = entity
+        self.keys[entity] = key
+        self._file(key, entity.rect)
+
+    def remove(self, entity):
+        """
+        Take an entity out of the grid.
+
+        Args:
+            entity: An entity previously passed to `insert`.
+        """
+        key = self.keys.pop(entity)
+        del self.entities[key]
+        self._unfile(key)
+
+    def move(self, entity):
+        """
+        Re-file an entity after its rect has moved.
+
+        Only touches the grid when the entity crossed into a different set of
+        cells, so small per-frame moves are cheap.
+
+        Args:
+            entity: An entity previously passed to `insert`.
+        """
+        key = self.keys[entity]
+        if self._span(entity.rect) == self.spans.get(key):
+            return
+        self._unfile(key)
+        self._file(key, entity.rect)
+
+    def _span(self, rect):
+        # Empty rects never collide with anything, so they live in no cell
+        if rect.width <= 0 or rect.height <= 0:
+            return None
+        return self._cell_span(rect)
+
+    def _file(self, key, rect):
+        span = self._span(rect)
+        if span is None:
+            return
+        self.spans[key] = span
+
+        left, top, right, bottom = span
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(key)
+
+    def _unfile(self, key):
+        span = self.spans.pop(key, None)
+        if span is None:
+            return
+
+        left, top, right, bottom = span
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = self.cells[(cell_x, cell_y)]
+                bucket.remove(key)
+                if not bucket:
+                    del self.cells[(cell_x, cell_y)]
+
+    def _query_keys(self, rect):
+        left, top, right, bottom = self._cell_span(rect)
+        cells = self.cells
+        found = set()
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def query(self, rect):
+        """
+        Find entities whose cells overlap `rect`.
+
+        This is a broad test: callers still run `colliderect` on the results.
+
+        Args:
+            rect (pygame.Rect): Area to search, in world coordinates.
+
+        Returns:
+            list: Candidate entities, in insertion order.
+        """
+        entities = self.entities
+        return [entities[key] for key in self._query_keys(rect)]
+
+    def sweep(self, rect, area):
+        """
+        Yield candidates for a collision pass that may move `rect` as it goes.
+
+        The caller resolves each yielded entity against `rect` and may push it
+        out. If a push moves `rect` outside the searched area, the area grows
+        and later entities are picked up, so the result matches a linear scan
+        over every entity in insertion order.
+
+        Args:
+            rect (pygame.Rect): The moving rect, read again after every yield.
+            area (pygame.Rect): Area swept by `rect` during the move.
+        """
+        entities = self.entities
+        covered = area.union(rect)
+        keys = self._query_keys(covered)
+        position = 0
+        while position < len(keys):
+            key = keys[position]
+            position += 1
+            yield entities[key]
+
+            if not covered.contains(rect):
+                covered.union_ip(rect)
+                keys = [later for later in self._query_keys(covered) if later > key]
+                position = 0
+
+
+def nearby(platforms, rect, area):
+    """
+    Platforms to test against `rect`, from a grid or a plain list.
+
+    Args:
+        platforms: A SpatialHash or any iterable of entities.
+        rect (pygame.Rect): The moving rect.
+        area (pygame.Rect): Area swept by `rect` during the move.
+    """
+    if isinstance(platforms, SpatialHash):
+        return platforms.sweep(rect, area)
+    return platforms
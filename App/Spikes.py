@@ -65,7 +65,7 @@ class Spikes(Entity):
 
     def check_collision(self, player):
         """
-        Check if the player collides with the spikes.
+        Check if the player touched the spikes anywhere along its last move.
 
         Args:
             player (Player): The player object.
@@ -73,4 +73,4 @@ class Spikes(Entity):
         Returns:
             bool: True if collision occurs, False otherwise.
         """
-        return self.rect.colliderect(player.rect)
+        return player.path.contact_time(self.rect) is not None
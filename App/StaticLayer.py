@@ -0,0 +1,112 @@
+from collections import OrderedDict
+import pygame
+from Camera import Camera
+
+CHUNK_PADDING = 8
+
+
+class StaticLayer:
+    """
+    Pre-rendered level geometry that never moves (platforms, lava, spikes).
+
+    The world is cut into fixed-width columns. Each column is drawn once into
+    its own surface the first time the camera reaches it, and after that a
+    frame only blits the one to three columns that overlap the viewport.
+    """
+
+    def __init__(self, index, world_height, chunk_width=512, max_chunks=16):
+        """
+        Initialize the layer.
+
+        Args:
+            index (SpatialHash): Static entities, in draw order.
+            world_height (int): Height of the game world.
+            chunk_width (int): Width of each baked column, in pixels.
+            max_chunks (int): How many baked columns to keep around at once.
+        """
+        self.world_height = world_height
+        self.chunk_width = chunk_width
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # chunk index -> baked surface, oldest first
+        self.blitted = 0  # Chunks blitted during the last call to draw()
+        self.invalidate(index)
+
+    def invalidate(self, index=None):
+        """
+        Throw away every baked chunk so it is redrawn the next time it is seen.
+
+        Call this whenever the level geometry changes.
+
+        Args:
+            index (SpatialHash): New static entities, or None to keep the
+                current ones.
+        """
+        if index is not None:
+            self.index = index
+        self.chunks.clear()
+
+    def invalidate_area(self, left, right):
+        """
+        Throw away the baked chunks covering world x from `left` to `right`.
+
+        Args:
+            left (int): Left edge of the changed area.
+            right (int): Right edge of the changed area.
+        """
+        for chunk in range(
+            left // self.chunk_width, (right - 1) // self.chunk_width + 1
+        ):
+            self.chunks.pop(chunk, None)
+
+    def _bake(self, chunk):
+        # pygame draws an outline along the surface edge when a rect is
+        # clipped, so bake with some padding and only ever blit the middle
+        width = self.chunk_width + 2 * CHUNK_PADDING
+        chunk_camera = Camera(width, self.world_height, 0, 0)
+        chunk_camera.rect.x = chunk * self.chunk_width - CHUNK_PADDING
+        entities = self.index.query(chunk_camera.rect)
+        if not entities:
+            return None  # Nothing to draw in this column
+
+        surface = pygame.Surface((width, self.world_height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        # Entities draw themselves through a camera parked over this chunk
+        for entity in entities:
+            entity.draw(surface, chunk_camera)
+        return surface
+
+    def _chunk(self, chunk):
+        if chunk not in self.chunks:
+            surface = self._bake(chunk)
+            self.chunks[chunk] = surface
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+        else:
+            surface = self.chunks[chunk]
+            self.chunks.move_to_end(chunk)
+        return surface
+
+    def draw(self, screen, camera):
+        """
+        Blit the baked columns that overlap the camera viewport.
+
+        Args:
+            screen (pygame.Surface): The game screen.
+            camera (Camera): The camera object for world-to-screen translation.
+        """
+        first = max(camera.rect.left, 0) // self.chunk_width
+        last = (camera.rect.right - 1) // self.chunk_width
+
+        area = pygame.Rect(CHUNK_PADDING, 0, self.chunk_width, self.world_height)
+        self.blitted = 0
+        for chunk in range(first, last + 1):
+            surface = self._chunk(chunk)
+            if surface is not None:
+                screen.blit(
+                    surface,
+                    (chunk * self.chunk_width - camera.rect.x, -camera.rect.y),
+                    area,
+                )
+                self.blitted += 1
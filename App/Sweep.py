@@ -0,0 +1,117 @@
+def time_of_impact(rect, dx, dy, target):
+    """
+    When a rect moving in a straight line by (dx, dy) starts to overlap
+    `target`.
+
+    Overlap means what it does for colliderect: rects that only touch don't
+    overlap, and empty rects never overlap anything.
+
+    Args:
+        rect (pygame.Rect): The moving rect, where the move starts.
+        dx, dy (int): The move, in pixels.
+        target (pygame.Rect): The rect it may run into.
+
+    Returns:
+        float: Fraction of the move, below 1, after which the two overlap;
+            negative if they already do before it starts. None if they
+            don't overlap at any point of the move.
+    """
+    if not (rect.width and rect.height and target.width and target.height):
+        return None
+
+    entry = float("-inf")
+    leave = float("inf")
+    for start, end, other_start, other_end, delta in (
+        (rect.left, rect.right, target.left, target.right, dx),
+        (rect.top, rect.bottom, target.top, target.bottom, dy),
+    ):
+        if delta == 0:
+            # Still along this axis, so it overlaps throughout or never
+            if end <= other_start or start >= other_end:
+                return None
+            continue
+
+        # Times the two start and stop overlapping along this axis
+        if delta > 0:
+            near = (other_start - end) / delta
+            far = (other_end - start) / delta
+        else:
+            near = (other_end - start) / delta
+            far = (other_start - end) / delta
+        entry = max(entry, near)
+        leave = min(leave, far)
+
+    if entry >= leave or entry >= 1 or leave <= 0:
+        return None
+    return entry
+
+
+def first_impact(entities, rect, dx, dy):
+    """
+    Find how far `rect` can move by (dx, dy) before it runs into one of
+    `entities`. Entities it already overlaps are not in its way.
+
+    Args:
+        entities: Entities with a `rect` attribute to test.
+        rect (pygame.Rect): The moving rect, where the move starts.
+        dx, dy (int): The move, in pixels.
+
+    Returns:
+        float: Fraction of the move at which the first entity is hit, or
+            None if nothing is.
+    """
+    first = None
+    for entity in entities:
+        time = time_of_impact(rect, dx, dy, entity.rect)
+        if time is not None and time >= 0 and (first is None or time < first):
+            first = time
+    return first
+
+
+class Path:
+    """
+    The straight moves a rect made during one tick, so anything it passed
+    through can be found, not only what it overlaps where it ended up.
+    """
+
+    def __init__(self):
+        self.moves = []  # (rect before the move, dx, dy)
+
+    def add(self, start, end):
+        """
+        Record a move.
+
+        Args:
+            start (pygame.Rect): Where the move started. It is kept rather
+                than copied, so it must not change afterwards.
+            end (pygame.Rect): Where it ended, the same size as `start`.
+        """
+        self.moves.append((start, end.x - start.x, end.y - start.y))
+
+    @property
+    def area(self):
+        """pygame.Rect: Bounds of everything the rect covered."""
+        rects = []
+        for start, dx, dy in self.moves:
+            rects.append(start)
+            rects.append(start.move(dx, dy))
+        return rects[0].unionall(rects)
+
+    def contact_time(self, target):
+        """
+        When the rect first overlapped `target` along the path.
+
+        Args:
+            target (pygame.Rect): The rect to test.
+
+        Returns:
+            float: 0 for overlapping from the start of the path, up to the
+                number of moves for only overlapping at its end, so contacts
+                can be handled in the order they happened. None if the rect
+                never overlapped `target`.
+        """
+        for number, (start, dx, dy) in enumerate(self.moves):
+            time = time_of_impact(start, dx, dy, target)
+            if time is not None:
+                return number + max(time, 0.0)
+        return None
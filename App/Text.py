@@ -0,0 +1,64 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextRenderer:
+    """
+    Resolves fonts once and keeps recently rendered text surfaces around, so
+    drawing the same string every frame doesn't re-rasterize it.
+    """
+
+    def __init__(self, max_surfaces=256):
+        """
+        Initialize the text renderer.
+
+        Args:
+            max_surfaces (int): How many rendered surfaces to keep before the
+                least recently used one is dropped.
+        """
+        self.max_surfaces = max_surfaces
+        self.fonts = {}  # (name, size) -> pygame.font.Font
+        self.surfaces = OrderedDict()  # (font, text, color, antialias) -> Surface
+
+    def font(self, name, size):
+        """
+        Look up a system font, searching the font list only the first time.
+
+        Args:
+            name (str): System font name, e.g. "Comic Sans MS".
+            size (int): Point size.
+
+        Returns:
+            pygame.font.Font: The resolved font.
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Render a line of text, reusing the surface if it was drawn recently.
+
+        Args:
+            font (pygame.font.Font): Font from `font()`.
+            text (str): The text to render.
+            color (tuple): RGB text color.
+            antialias (bool): Whether to smooth the glyph edges.
+
+        Returns:
+            pygame.Surface: The rendered text. Treat it as read-only.
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
@@ -1,9 +1,102 @@
+import argparse
+import time
 from Game import Game
+from Input import Controls, KeyboardInput, ScriptedInput
+from Level import DEFAULT_LEVEL
+from Replay import InputRecorder, load_run, record, replay, save_run
+
+
+def autopilot(tick):
+    """Run right, hopping every 40 ticks: enough to smoke-test a level."""
+    return Controls(False, True, tick % 40 == 0)
+
+
+def profile_path(path):
+    """Check --profile names a file FrameProfiler.export can write."""
+    if not path.endswith((".csv", ".json")):
+        raise argparse.ArgumentTypeError(f"{path} must end in .csv or .json")
+    return path
 
 
 def main():
-    game = Game()
-    game.start()
+    parser = argparse.ArgumentParser(description="Samu's Bizzare Adventure")
+    parser.add_argument("--level", default=DEFAULT_LEVEL, help="level file to play")
+    parser.add_argument(
+        "--streaming", action="store_true", help="stream the level in chunks"
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="simulate without a window, audio or drawing, as fast as possible",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        default=36_000,
+        help="stop a headless run after this many ticks (default: 10 minutes)",
+    )
+    parser.add_argument("--record", metavar="PATH", help="save the run's input here")
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay a recorded run headless at full speed and check it matches",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="redraw only what changed while the camera is still",
+    )
+    parser.add_argument(
+        "--profile",
+        type=profile_path,
+        metavar="PATH",
+        help="time each phase of every frame from the start (F4 toggles it "
+        "in game) and write the timings to a .csv or .json file on exit; "
+        "without it, F4 only shows them on screen",
+    )
+    args = parser.parse_args()
+    if args.profile and (args.headless or args.replay):
+        # Headless runs never draw, so there are no frames to time
+        parser.error("--profile can't be used with --headless or --replay")
+
+    if args.replay:
+        start = time.perf_counter()
+        game = replay(load_run(args.replay), args.level, args.streaming)
+        report(game, time.perf_counter() - start)
+        return
+
+    input_source = ScriptedInput(autopilot) if args.headless else KeyboardInput()
+    if args.record:
+        input_source = InputRecorder(input_source)
+    game = Game(
+        args.level,
+        args.streaming,
+        headless=args.headless,
+        input_source=input_source,
+        dirty_rects=args.dirty_rects,
+    )
+
+    if args.headless:
+        start = time.perf_counter()
+        game.simulate(args.ticks)
+        report(game, time.perf_counter() - start)
+    else:
+        if args.profile:
+            game.profiler.toggle()
+        game.start()
+        if args.profile:
+            game.profiler.export(args.profile)
+
+    if args.record:
+        save_run(args.record, record(game, args.level))
+
+
+def report(game, elapsed):
+    print(
+        f"{game.ticks} ticks in {elapsed:.3f}s ({game.ticks / elapsed:.0f} ticks/s), "
+        f"level complete: {game.level_complete}, "
+        f"coins: {game.total_coins_collected}/{game.coin_count}"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,353 @@
+"""
+Benchmark the game's hot paths on the shipped level and on synthetic levels
+of increasing size, under SDL's dummy video and audio drivers.
+
+Run from the repository root:
+
+    python App/bench.py              # print timings
+    python App/bench.py --save       # record them as the baseline
+    python App/bench.py --compare    # compare with the baseline, exit 1 on regressions
+
+Each benchmark is timed over several samples; the tables show the median,
+mean, standard deviation and best sample, per call (or per frame).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+from Camera import Camera
+from Coin import Coin
+from Enemy import Enemy
+from EnemySystem import EnemySystem
+from Flag import Flag
+from Game import Game
+from Input import ScriptedInput
+from Lava import Lava
+from Level import Level, DEFAULT_LEVEL
+from Platform import Platform
+from Player import Player
+from Runner import RandomPolicy
+from Spikes import Spikes
+
+BASELINE_PATH = os.path.join(".", "App", "bench_baseline.json")
+SAMPLES = 7
+SYNTHETIC_SCALES = [4, 16]  # Copies of the shipped level laid end to end
+
+# A benchmark regresses when both its median and its best sample are this
+# much slower than the baseline's, and the medians differ by more than the
+# noise in either run
+REGRESSION_THRESHOLD = 0.10
+NOISE_DEVIATIONS = 3
+
+
+def tiled_level(scale):
+    """
+    Lay `scale` copies of the shipped level side by side, with the flag at
+    the far end, keeping its density while growing its size.
+
+    Returns:
+        dict: Level data, as in levels/level1.json.
+    """
+    with open(DEFAULT_LEVEL) as level_file:
+        data = json.load(level_file)
+
+    width = data["world"]["width"]
+    tiled = dict(data, world=dict(data["world"], width=width * scale))
+    for key in ("platforms", "lava", "spikes", "coins"):
+        tiled[key] = [
+            [entity[0] + width * copy, *entity[1:]]
+            for copy in range(scale)
+            for entity in data.get(key, [])
+        ]
+
+    tiled["enemies"] = []
+    for copy in range(scale):
+        shift = width * copy
+        for enemy in data.get("enemies", []):
+            x, y, enemy_width, enemy_height = enemy["rect"]
+            shifted = dict(enemy, rect=[x + shift, y, enemy_width, enemy_height])
+            if (
+                enemy.get("bounds")
+                and enemy.get("movement", "horizontal") == "horizontal"
+            ):
+                shifted["bounds"] = [bound + shift for bound in enemy["bounds"]]
+            tiled["enemies"].append(shifted)
+
+    x, *rest = data["flag"]["rect"]
+    tiled["flag"] = dict(data["flag"], rect=[x + width * (scale - 1), *rest])
+    return tiled
+
+
+def write_levels(directory):
+    """
+    Returns:
+        list: (name, path) for the shipped level and each synthetic one.
+    """
+    levels = [("level1", DEFAULT_LEVEL)]
+    for scale in SYNTHETIC_SCALES:
+        path = os.path.join(directory, f"tiled-x{scale}.json")
+        with open(path, "w") as level_file:
+            json.dump(tiled_level(scale), level_file)
+        levels.append((f"tiled-x{scale}", path))
+    return levels
+
+
+def aimed_cameras(level, entities):
+    """A camera centred on each entity, so every draw actually blits."""
+    cameras = []
+    for entity in entities:
+        camera = Camera(800, 600, level.world_width, level.world_height)
+        camera.update(entity)
+        cameras.append(camera)
+    return cameras
+
+
+# Each benchmark takes a level path and returns (run, calls): `run` does
+# one sample's worth of work and `calls` is how many calls that covers.
+
+
+def bench_player_update(level_path):
+    game = Game(level_path, headless=True, input_source=ScriptedInput(RandomPolicy(0)))
+
+    def run():
+        for _ in range(600):
+            game.player.update(game.tick_time, game.platform_index)
+
+    return run, 600
+
+
+def bench_enemy_update(level_path):
+    enemies = Level.load(level_path).enemies
+
+    def run():
+        for _ in range(100):
+            for enemy in enemies:
+                enemy.update()
+
+    return run, 100 * len(enemies)
+
+
+def bench_enemy_system(level_path):
+    system = EnemySystem(Level.load(level_path).enemies)
+
+    def run():
+        for _ in range(100):
+            system.update()
+
+    return run, 100
+
+
+def draw_benchmark(kind):
+    def bench(level_path):
+        level = Level.load(level_path)
+        if kind is Player:
+            x, y, width, height = level.player_start
+            entities = [
+                Player(x, y, width, height, level.world_width, level.world_height)
+            ]
+        else:
+            entities = [
+                entity
+                for entity in [
+                    *level.platforms,
+                    *level.lava_pools,
+                    *level.spike_traps,
+                    *level.coins,
+                    *level.enemies,
+                    level.flag,
+                ]
+                if type(entity) is kind
+            ]
+        pairs = list(zip(entities, aimed_cameras(level, entities)))
+        screen = pygame.display.get_surface()
+        repeats = max(1, 2000 // len(pairs))
+
+        def run():
+            for _ in range(repeats):
+                for entity, camera in pairs:
+                    entity.draw(screen, camera)
+
+        return run, repeats * len(pairs)
+
+    return bench
+
+
+def bench_camera_apply(level_path):
+    level = Level.load(level_path)
+    entities = [*level.platforms, *level.lava_pools, *level.spike_traps, *level.coins]
+    camera = Camera(800, 600, level.world_width, level.world_height)
+
+    def run():
+        for _ in range(20):
+            for entity in entities:
+                camera.apply(entity)
+
+    return run, 20 * len(entities)
+
+
+def frame_benchmark(dirty_rects):
+    def bench(level_path):
+        game = Game(
+            level_path,
+            input_source=ScriptedInput(RandomPolicy(0)),
+            dirty_rects=dirty_rects,
+        )
+        game.wait_until_loaded()
+
+        def run():
+            for _ in range(60):
+                game.frame(game.tick_time)
+
+        return run, 60
+
+    return bench
+
+
+BENCHMARKS = [
+    ("player_update", bench_player_update),
+    ("enemy_update", bench_enemy_update),
+    ("enemy_system", bench_enemy_system),
+    *[
+        (f"draw_{kind.__name__.lower()}", draw_benchmark(kind))
+        for kind in (Platform, Lava, Spikes, Coin, Enemy, Flag, Player)
+    ],
+    ("camera_apply", bench_camera_apply),
+    ("frame", frame_benchmark(False)),
+    ("frame_dirty", frame_benchmark(True)),
+]
+
+
+def measure(run, calls, samples=SAMPLES):
+    """
+    Time `run` `samples` times, after one warm-up.
+
+    Returns:
+        dict: Median, mean, standard deviation and best, in microseconds per
+            call.
+    """
+    run()
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return {
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings),
+        "best": min(timings),
+    }
+
+
+def run_suite(only=None):
+    """
+    Run every benchmark on every level.
+
+    Args:
+        only (str): Run only benchmarks whose name contains this.
+
+    Returns:
+        dict: "benchmark[level]" -> timings from `measure`.
+    """
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for level_name, level_path in write_levels(directory):
+            for name, bench in BENCHMARKS:
+                if only and only not in name:
+                    continue
+                key = f"{name}[{level_name}]"
+                results[key] = measure(*bench(level_path))
+                timing = results[key]
+                print(
+                    f"{key:<28} {timing['median']:10.2f} us  "
+                    f"(mean {timing['mean']:.2f} ± {timing['stdev']:.2f}, "
+                    f"best {timing['best']:.2f})",
+                    flush=True,
+                )
+    return results
+
+
+def compare(results, baseline):
+    """
+    Print each benchmark against the baseline.
+
+    Returns:
+        list: Names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<28} {'baseline':>10} {'now':>10} {'change':>8}")
+    for key, timing in results.items():
+        before = baseline.get(key)
+        if before is None:
+            print(f"{key:<28} {'-':>10} {timing['median']:10.2f}      new")
+            continue
+        change = timing["median"] / before["median"] - 1
+        noise = NOISE_DEVIATIONS * max(timing["stdev"], before["stdev"])
+        regressed = (
+            change > REGRESSION_THRESHOLD
+            and timing["best"] / before["best"] - 1 > REGRESSION_THRESHOLD
+            and timing["median"] - before["median"] > noise
+        )
+        if regressed:
+            regressions.append(key)
+        print(
+            f"{key:<28} {before['median']:10.2f} {timing['median']:10.2f} "
+            f"{change:+8.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the game's hot paths on real and synthetic levels."
+    )
+    parser.add_argument("--save", action="store_true", help="write the baseline")
+    parser.add_argument(
+        "--compare", action="store_true", help="compare with the baseline"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--only", help="run only benchmarks whose name contains this")
+    args = parser.parse_args()
+    if args.compare and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}, record one with --save")
+
+    results = run_suite(args.only)
+
+    if args.compare:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"baseline from {baseline['machine']}, python {baseline['python']}")
+        regressions = compare(results, baseline["results"])
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            raise SystemExit(1)
+
+    if args.save:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(
+                {
+                    "machine": platform.platform(),
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                baseline_file,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"baseline written to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measure BatchEnv's throughput against a single Game.
+
+Run from the repository root, after checking the two still agree with
+check_parity.py:
+
+    python App/bench_batch.py
+"""
+
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+from BatchEnv import BatchEnv
+from check_parity import random_actions
+from Game import Game
+
+BENCH_TICKS = 300
+BATCH_SIZES = [1, 64, 1_024, 8_192]
+
+
+def main():
+    game = Game(headless=True)
+    start = time.perf_counter()
+    game.simulate(BENCH_TICKS)
+    scalar_rate = BENCH_TICKS / (time.perf_counter() - start)
+    print(f"{'Game':>12} | {scalar_rate:12,.0f} player ticks/s")
+
+    rng = np.random.default_rng(1)
+    for size in BATCH_SIZES:
+        env = BatchEnv(size)
+        actions = random_actions(rng, size, BENCH_TICKS)
+        start = time.perf_counter()
+        for tick in range(BENCH_TICKS):
+            env.step(actions[tick])
+        rate = size * BENCH_TICKS / (time.perf_counter() - start)
+        print(
+            f"{size:>6} batch | {rate:12,.0f} player ticks/s | "
+            f"{rate / scalar_rate:6.1f}x Game"
+        )
+
+
+if __name__ == "__main__":
+    main()
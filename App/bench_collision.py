@@ -0,0 +1,115 @@
+"""
+Benchmark Player.update against the platform index and a plain list.
+
+Run from the repository root:
+
+    python App/bench_collision.py
+"""
+
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from Input import Controls, ScriptedInput
+from Platform import Platform
+from Player import Player
+from SpatialIndex import SpatialHash
+
+FRAMES = 600
+PLATFORM_COUNTS = [100, 1_000, 10_000, 50_000]
+
+
+def generate_platforms(count, seed=0):
+    """Scatter `count` platforms over a world wide enough to keep density constant."""
+    rng = random.Random(seed)
+    world_width = count * 60
+    platforms = [Platform(0, 550, world_width, 50)]
+    for _ in range(count - 1):
+        platforms.append(
+            Platform(
+                rng.randrange(0, world_width),
+                rng.randrange(100, 550),
+                rng.choice((30, 50, 100)),
+                rng.choice((20, 50)),
+            )
+        )
+    return platforms, world_width
+
+
+def random_controls(seed):
+    """Random controls, different every tick but the same for a given seed."""
+    rng = random.Random(seed)
+    return ScriptedInput(
+        lambda tick: Controls(
+            rng.random() < 0.3, rng.random() < 0.5, rng.random() < 0.1
+        )
+    )
+
+
+def run(player, platforms, frames):
+    trace = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        player.update(1 / 60, platforms)
+        trace.append((player.rect.x, player.rect.y, player.on_ground))
+    elapsed = time.perf_counter() - start
+    return elapsed, trace
+
+
+def lands_from_fast_fall(platforms):
+    """
+    Move a player 500 pixels down in one tick, past a 2 pixel thick platform,
+    and check it lands rather than passing through.
+    """
+    player = Player(50, 0, 50, 110, 200, 1000, ScriptedInput(()))
+    player.velocity_y = 500
+    player.update(1 / 60, platforms)
+    return player.rect.bottom == 400 and player.on_ground
+
+
+def main():
+    pygame.init()
+    thin = [Platform(0, 400, 200, 2)]
+    for name, platforms in [("list", thin), ("index", SpatialHash.from_entities(thin))]:
+        landed = lands_from_fast_fall(platforms)
+        print(
+            f"fast fall onto a thin platform ({name}): {'lands' if landed else 'TUNNELS'}"
+        )
+
+    for count in PLATFORM_COUNTS:
+        platforms, world_width = generate_platforms(count)
+
+        build_start = time.perf_counter()
+        index = SpatialHash.from_entities(platforms)
+        build_time = time.perf_counter() - build_start
+
+        linear_time, linear_trace = run(
+            Player(
+                world_width // 2, 300, 50, 110, world_width, 600, random_controls(count)
+            ),
+            platforms,
+            FRAMES,
+        )
+        index_time, index_trace = run(
+            Player(
+                world_width // 2, 300, 50, 110, world_width, 600, random_controls(count)
+            ),
+            index,
+            FRAMES,
+        )
+
+        print(
+            f"{count:>7} platforms | "
+            f"list {linear_time / FRAMES * 1e6:9.1f} us/frame | "
+            f"index {index_time / FRAMES * 1e6:7.1f} us/frame | "
+            f"build {build_time * 1e3:7.1f} ms | "
+            f"{'match' if linear_trace == index_trace else 'MISMATCH'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Check that the batched code plays exactly like the objects it stands in
+for: BatchEnv against one Game per player, and EnemySystem against
+Enemy.update.
+
+Exits with status 1 if any state differs. Run from the repository root:
+
+    python App/check_parity.py
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+from BatchEnv import BatchEnv
+from Enemy import Enemy, EnemyMovement
+from EnemySystem import EnemySystem
+from Game import Game
+from Input import ScriptedInput, decode
+from Player import REFERENCE_TICK_RATE
+
+PARITY_PLAYERS = 24
+PARITY_TICKS = 3_000
+PARITY_TICK_RATES = (60, 144)  # The reference rate, and one with fractional moves
+FLAG_START = (5_200, 380)
+PARITY_ENEMIES = 64  # Enough for EnemySystem to batch them
+ENEMY_SPEEDS = [1, 2, 3, 5, 1.5, 2.25]
+
+
+def random_actions(rng, players, ticks):
+    """
+    Controls held for random stretches, mostly heading right, so players
+    get far enough to meet hazards, coins and the flag.
+    """
+    choices = np.array([0, 1, 2, 2, 2, 4, 6, 6, 5])
+    actions = np.empty((ticks, players), dtype=np.int64)
+    for player in range(players):
+        tick = 0
+        while tick < ticks:
+            length = rng.integers(1, 40)
+            actions[tick : tick + length, player] = rng.choice(choices)
+            tick += length
+    return actions
+
+
+def scalar_state(game):
+    player = game.player
+    bounce = player.bounce_effect
+    return (
+        player.rect.x,
+        player.rect.y,
+        player.velocity_y,
+        player.on_ground,
+        bounce.active,
+        bounce.elapsed_time if bounce.active else 0.0,
+        game.total_coins_collected,
+        game.level_complete,
+    )
+
+
+def batch_state(env, player):
+    return (
+        env.x[player],
+        env.y[player],
+        env.velocity_y[player],
+        env.on_ground[player],
+        env.hit[player],
+        env.hit_time[player] if env.hit[player] else 0.0,
+        env.coins[player],
+        env.done[player],
+    )
+
+
+def check_players(seed=0, tick_rate=60):
+    """
+    Step a batch and one headless Game per player with the same controls,
+    comparing every player's state after every tick.
+
+    Args:
+        seed (int): Seed for the random controls.
+        tick_rate (int): Simulation ticks per second for both.
+
+    Returns:
+        tuple: (mismatches, hits, coins, finished) over the whole run.
+    """
+    actions = random_actions(np.random.default_rng(seed), PARITY_PLAYERS, PARITY_TICKS)
+    games = [
+        Game(
+            headless=True,
+            input_source=ScriptedInput([decode(bits) for bits in actions[:, player]]),
+            tick_rate=tick_rate,
+        )
+        for player in range(PARITY_PLAYERS)
+    ]
+    env = BatchEnv(PARITY_PLAYERS, tick_rate=tick_rate)
+
+    # The first player starts beside the flag, so finishing is covered too
+    games[0].player.rect.topleft = FLAG_START
+    env.x[0], env.y[0] = FLAG_START
+
+    mismatches = hits = 0
+    for tick in range(PARITY_TICKS):
+        env.step(actions[tick])
+        for player, game in enumerate(games):
+            if not game.level_complete:
+                game.step()
+            if scalar_state(game) != batch_state(env, player):
+                mismatches += 1
+        hits += int(env.hit.sum())
+    return mismatches, hits, int(env.coins.sum()), int(env.done.sum())
+
+
+def random_enemies(rng, count):
+    """
+    Enemies patrolling both axes at whole and fractional speeds, some
+    without bounds.
+    """
+    enemies = []
+    for _ in range(count):
+        movement = EnemyMovement(int(rng.integers(1, 3)))
+        x, y = (int(value) for value in rng.integers(0, 2_000, size=2))
+        start = x if movement == EnemyMovement.HORIZONTAL else y
+        bounds = (start - 100, start + 200) if rng.random() < 0.9 else None
+        speed = ENEMY_SPEEDS[rng.integers(len(ENEMY_SPEEDS))]
+        enemies.append(Enemy(x, y, 40, 40, movement, speed, bounds))
+    return enemies
+
+
+def enemy_state(enemy):
+    return (
+        enemy.rect.topleft,
+        enemy.previous_position,
+        enemy.direction,
+        enemy.current_frame_index,
+        enemy.frame_timer,
+        enemy.carry,
+    )
+
+
+def check_enemies(seed=0, tick_rate=60):
+    """
+    Step a batched EnemySystem and the same enemies through Enemy.update,
+    comparing every enemy's state after every tick.
+
+    Args:
+        seed (int): Seed for the enemies' placement, speed and patrols.
+        tick_rate (int): Simulation ticks per second for both.
+
+    Returns:
+        int: Mismatched enemy states over the whole run.
+    """
+    batched = random_enemies(np.random.default_rng(seed), PARITY_ENEMIES)
+    reference = random_enemies(np.random.default_rng(seed), PARITY_ENEMIES)
+    system = EnemySystem(batched, batched=True)
+    ticks = (1 / tick_rate) * REFERENCE_TICK_RATE  # As Game.step works it out
+
+    mismatches = 0
+    for _ in range(PARITY_TICKS):
+        system.update(ticks)
+        system.sync()
+        for enemy, expected in zip(batched, reference):
+            expected.previous_position = expected.rect.topleft
+            expected.update(ticks)
+            if enemy_state(enemy) != enemy_state(expected):
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    failed = False
+    for tick_rate in PARITY_TICK_RATES:
+        mismatches = check_enemies(tick_rate=tick_rate)
+        print(
+            f"enemies: {PARITY_ENEMIES} x {PARITY_TICKS} ticks at {tick_rate} Hz | "
+            f"{'match' if not mismatches else f'{mismatches} MISMATCHES'}"
+        )
+        failed = failed or bool(mismatches)
+    for tick_rate in PARITY_TICK_RATES:
+        mismatches, hits, coins, finished = check_players(tick_rate=tick_rate)
+        print(
+            f"players: {PARITY_PLAYERS} x {PARITY_TICKS} ticks at {tick_rate} Hz, "
+            f"{hits} knocked-back player ticks, {coins} coins, "
+            f"{finished} finished | "
+            f"{'match' if not mismatches else f'{mismatches} MISMATCHES'}"
+        )
+        failed = failed or bool(mismatches)
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Pack every sprite the game draws into one atlas image plus a JSON index.
+
+Each sprite is stored already scaled to the size the game asks for, so at
+runtime the atlas is decoded once and sprites are handed out as subsurfaces.
+Re-run this after changing any image under App/assets or any sprite size:
+
+    python App/pack_atlas.py
+"""
+
+import json
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from Assets import AssetManager, ATLAS_IMAGE_PATH, ATLAS_INDEX_PATH, atlas_key
+from BounceEffect import ON_HIT_IMAGE_PATH
+from Coin import COIN_IMAGE_PATH
+from Enemy import MOVEMENT_FRAME_PATHS
+from Player import STATIC_FRAME, JUMP_FRAMES, WALK_FRAMES, HIT_FRAMES
+
+FLAG_IMAGE_PATH = os.path.join(".", "App", "assets", "ending", "samu_flag.png")
+
+ATLAS_WIDTH = 1024
+PADDING = 1  # Transparent gap between sprites
+
+# (path, size) for sized sprites, (path, height) for sprites that keep their
+# aspect ratio. These must match the sizes the game requests.
+SIZED_SPRITES = [
+    *[(path, (50, 50)) for path in MOVEMENT_FRAME_PATHS],
+    (COIN_IMAGE_PATH, (35, 35)),
+    (ON_HIT_IMAGE_PATH, (60, 60)),
+    (FLAG_IMAGE_PATH, (70, 350)),
+]
+HEIGHT_SPRITES = [
+    *[(path, 110) for path in [STATIC_FRAME, *JUMP_FRAMES, *WALK_FRAMES]],
+    *[(path, 80) for path in HIT_FRAMES],
+]
+
+
+def collect_sprites(manager):
+    """Scale every sprite in the manifest, keyed by its atlas name."""
+    sprites = {}
+    for path, size in SIZED_SPRITES:
+        sprites[atlas_key(path, size)] = manager.image(path, size)
+    for path, height in HEIGHT_SPRITES:
+        surface = manager.image_with_height(path, height)
+        sprites[atlas_key(path, surface.get_size())] = surface
+    return sprites
+
+
+def pack(sprites):
+    """
+    Place sprites on shelves, tallest first.
+
+    Returns:
+        tuple: (rects, height) with rects mapping key -> (x, y, width, height).
+    """
+    rects = {}
+    x = y = shelf_height = 0
+    for key, surface in sorted(
+        sprites.items(), key=lambda item: (-item[1].get_height(), item[0])
+    ):
+        width, height = surface.get_size()
+        if x + width > ATLAS_WIDTH:
+            x = 0
+            y += shelf_height + PADDING
+            shelf_height = 0
+        rects[key] = (x, y, width, height)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+    return rects, y + shelf_height
+
+
+def main():
+    pygame.init()
+    manager = AssetManager()
+    sprites = collect_sprites(manager)
+    rects, height = pack(sprites)
+
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    for key, rect in rects.items():
+        # Copy pixels as-is; normal blending would darken soft edges
+        atlas.blit(sprites[key], rect[:2], special_flags=pygame.BLEND_RGBA_MAX)
+    pygame.image.save(atlas, ATLAS_IMAGE_PATH)
+
+    sources = {
+        atlas_key(path): manager.image(path).get_size()
+        for path, _ in [*SIZED_SPRITES, *HEIGHT_SPRITES]
+    }
+    with open(ATLAS_INDEX_PATH, "w") as index_file:
+        json.dump(
+            {"sprites": rects, "sources": sources}, index_file, indent=2, sort_keys=True
+        )
+
+    print(f"Packed {len(rects)} sprites into {ATLAS_WIDTH}x{height} {ATLAS_IMAGE_PATH}")
+
+
+if __name__ == "__main__":
+    main()